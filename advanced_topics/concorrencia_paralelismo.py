@@ -85,6 +85,177 @@ async def main():
 
 asyncio.run(main())
 
+
+# Serviço de download assíncrono
+# O download() acima abre uma ClientSession por URL (sem keep-alive) e a versão
+# com threading cria uma thread por URL (concorrência sem limite). Aqui:
+# - uma única ClientSession com pool de conexões (TCPConnector) reaproveitado
+# - semáforo por host: no máximo `por_host` downloads simultâneos em cada um
+# - corpo gravado em disco em blocos (nunca o arquivo inteiro em memória)
+# - orçamento de bytes em voo: lidos da rede e ainda não gravados
+# - novas tentativas com backoff exponencial e jitter ("full jitter")
+# - destino único por URL (host + hash da URL); destinos repetidos são recusados
+import hashlib
+import os
+import random
+import socket
+from collections import namedtuple
+from urllib.parse import urlsplit
+
+from aiohttp import web
+
+Resultado = namedtuple("Resultado", ["url", "caminho", "tamanho", "tentativas"])
+
+_REPETIR_STATUS = {408, 429, 500, 502, 503, 504}
+
+
+class ErroTransitorio(Exception):
+    pass
+
+
+class OrcamentoBytes:
+    """Semáforo contado em bytes"""
+
+    def __init__(self, limite):
+        self.limite = limite
+        self.em_uso = 0
+        self._cond = asyncio.Condition()
+
+    async def adquirir(self, n):
+        n = min(n, self.limite)
+        async with self._cond:
+            await self._cond.wait_for(lambda: self.em_uso + n <= self.limite)
+            self.em_uso += n
+        return n
+
+    async def liberar(self, n):
+        async with self._cond:
+            self.em_uso -= n
+            self._cond.notify_all()
+
+
+class Downloader:
+    def __init__(self, diretorio=".", por_host=4, total=100,
+                 max_bytes_em_voo=64 * 2**20, bloco=256 * 2**10,
+                 tentativas=4, backoff=0.5, backoff_max=30.0, timeout=30.0):
+        self.diretorio = diretorio
+        self.por_host = por_host
+        self.total = total
+        self.bloco = bloco
+        self.tentativas = tentativas
+        self.backoff = backoff
+        self.backoff_max = backoff_max
+        self.timeout = aiohttp.ClientTimeout(total=None, sock_connect=timeout, sock_read=timeout)
+        self.orcamento = OrcamentoBytes(max_bytes_em_voo)
+        self._hosts = {}
+        self._destinos = set()  # destinos com download em andamento
+        self.session = None
+
+    async def __aenter__(self):
+        conector = aiohttp.TCPConnector(limit=self.total, limit_per_host=self.por_host)
+        self.session = aiohttp.ClientSession(connector=conector, timeout=self.timeout)
+        return self
+
+    async def __aexit__(self, *args):
+        await self.session.close()
+
+    def _semaforo(self, url):
+        host = urlsplit(url).netloc
+        if host not in self._hosts:
+            self._hosts[host] = asyncio.Semaphore(self.por_host)
+        return self._hosts[host]
+
+    def _destino(self, url):
+        # example.com/ e example.org/ teriam o mesmo basename: host + hash desambiguam
+        partes = urlsplit(url)
+        nome = os.path.basename(partes.path) or "index.html"
+        resumo = hashlib.sha1(url.encode()).hexdigest()[:10]
+        return os.path.join(self.diretorio, f"{partes.hostname}_{resumo}_{nome}")
+
+    async def _transferir(self, url, parcial):
+        async with self.session.get(url) as response:
+            if response.status in _REPETIR_STATUS:
+                raise ErroTransitorio(f"HTTP {response.status}")
+            response.raise_for_status()
+            tamanho = 0
+            with open(parcial, "wb") as f:
+                while True:
+                    reservado = await self.orcamento.adquirir(self.bloco)
+                    try:
+                        dados = await response.content.read(reservado)
+                        if not dados:
+                            break
+                        await asyncio.to_thread(f.write, dados)  # disco fora do event loop
+                        tamanho += len(dados)
+                    finally:
+                        await self.orcamento.liberar(reservado)
+            return tamanho
+
+    async def baixar(self, url, destino=None):
+        destino = os.path.abspath(destino or self._destino(url))
+        if destino in self._destinos:
+            raise ValueError(f"destino já em uso por outro download: {destino}")
+        self._destinos.add(destino)
+        parcial = destino + ".part"
+        try:
+            async with self._semaforo(url):
+                for tentativa in range(1, self.tentativas + 1):
+                    try:
+                        tamanho = await self._transferir(url, parcial)
+                        os.replace(parcial, destino)  # só aparece completo
+                        return Resultado(url, destino, tamanho, tentativa)
+                    except (aiohttp.ClientConnectionError, aiohttp.ClientPayloadError,
+                            asyncio.TimeoutError, ErroTransitorio):
+                        if tentativa == self.tentativas:
+                            raise
+                        teto = min(self.backoff_max, self.backoff * 2 ** (tentativa - 1))
+                        await asyncio.sleep(random.uniform(0, teto))
+        except BaseException:
+            # qualquer falha (404, cancelamento, disco cheio) não deixa .part para trás
+            if os.path.exists(parcial):
+                os.remove(parcial)
+            raise
+        finally:
+            self._destinos.discard(destino)
+
+    async def baixar_todos(self, urls):
+        """Resultados na ordem das URLs; falhas voltam como exceções"""
+        return await asyncio.gather(*(self.baixar(url) for url in urls),
+                                    return_exceptions=True)
+
+
+# Teste contra um servidor local (sem depender da internet)
+async def demo_local(diretorio="/tmp", arquivos=20, tamanho=1_000_000):
+    corpo = os.urandom(tamanho)
+    falhas = {"arquivo_0.bin": 2}  # primeiras respostas com erro 503
+
+    async def servir(request):
+        nome = request.match_info["nome"]
+        if falhas.get(nome, 0) > 0:
+            falhas[nome] -= 1
+            return web.Response(status=503)
+        return web.Response(body=corpo)
+
+    app = web.Application()
+    app.router.add_get("/{nome}", servir)
+    runner = web.AppRunner(app)
+    await runner.setup()
+    sock = socket.socket()
+    sock.bind(("127.0.0.1", 0))  # porta livre escolhida pelo SO
+    porta = sock.getsockname()[1]
+    await web.SockSite(runner, sock).start()
+    try:
+        urls = [f"http://127.0.0.1:{porta}/arquivo_{i}.bin" for i in range(arquivos)]
+        async with Downloader(diretorio, por_host=4, max_bytes_em_voo=1 * 2**20,
+                              backoff=0.01) as downloader:
+            for resultado in await downloader.baixar_todos(urls):
+                print(resultado)
+    finally:
+        await runner.cleanup()
+
+
+# asyncio.run(demo_local())
+
 import urllib.request
 
 # Padrões avançados
@@ -113,6 +284,221 @@ with ProcessPoolExecutor() as executor:
     results = list(executor.map(calcular, range(100, 110)))
 
 
+# Motor de fatorial / binomial para inteiros enormes
+# O gargalo de calcular_fatorial não é o pickle (serializar um int é linear),
+# e sim a conversão para decimal: str(150000!) é quadrática (~10 s), e no
+# Python 3.11+ passa do limite de int_max_str_digits (ValueError). Aqui:
+# - fatorial por prime swing: n! = (n//2)!² · swing(n), com o produto dos
+#   fatores primos de swing(n) dividido entre processos (árvores de produto)
+# - cache LRU limitado em bytes; n! reaproveita o maior m! já em cache
+#   (n! = m! · (m+1)···n) e as metades (n//2)! da recursão
+# - saída como int, bytes (to_bytes, linear) ou dígitos decimais via decimal
+#   (divisão e conquista com multiplicação rápida da libmpdec, subquadrática)
+import bisect
+import decimal
+from collections import OrderedDict
+
+
+def _produto(valores):
+    """Árvore de produto balanceada: multiplica números de tamanhos parecidos"""
+    valores = list(valores) or [1]
+    while len(valores) > 1:
+        pares = [a * b for a, b in zip(valores[::2], valores[1::2])]
+        if len(valores) % 2:
+            pares.append(valores[-1])
+        valores = pares
+    return valores[0]
+
+
+def _produto_intervalo(inicio, fim):
+    return _produto(range(inicio, fim + 1))
+
+
+def _primos_ate(n):
+    crivo = bytearray([1]) * (n + 1)
+    crivo[:2] = b"\x00\x00"
+    for i in range(2, math.isqrt(n) + 1):
+        if crivo[i]:
+            crivo[i * i::i] = bytes(len(range(i * i, n + 1, i)))
+    return [i for i in range(n + 1) if crivo[i]]
+
+
+def _fatores_swing(n, primos):
+    # expoente de p em n!/((n//2)!)² = soma dos bits (n // p^k) & 1
+    fatores = []
+    for p in primos:
+        if p > n:
+            break
+        q, e = n, 0
+        while q := q // p:
+            e += q & 1
+        if e:
+            fatores.append(p ** e if e > 1 else p)
+    return fatores
+
+
+def int_para_digitos(n):
+    """str(n) subquadrático (mesma ideia do _pylong do CPython 3.12)"""
+    if n < 0:
+        return "-" + int_para_digitos(-n)
+    D = decimal.Decimal
+    with decimal.localcontext() as ctx:
+        ctx.prec = decimal.MAX_PREC
+        ctx.Emax = decimal.MAX_EMAX
+        ctx.Emin = decimal.MIN_EMIN
+        ctx.traps[decimal.Inexact] = True
+        potencias = {}
+
+        def dois_elevado(w):
+            if w not in potencias:
+                if w <= 8192:
+                    potencias[w] = D(2) ** w
+                elif w - 1 in potencias:
+                    potencias[w] = potencias[w - 1] * 2
+                else:
+                    metade = w >> 1
+                    potencias[w] = dois_elevado(metade) * dois_elevado(w - metade)
+            return potencias[w]
+
+        def converter(x, w):
+            if w <= 8192:
+                return D(x)
+            metade = w >> 1
+            alto = x >> metade
+            baixo = x - (alto << metade)
+            return converter(baixo, metade) + converter(alto, w - metade) * dois_elevado(metade)
+
+        return str(converter(n, n.bit_length()))
+
+
+def _formatar(valor, como):
+    if como == "int":
+        return valor
+    if como == "bytes":
+        return valor.to_bytes((valor.bit_length() + 7) // 8 or 1, "big")
+    if como == "digitos":
+        return int_para_digitos(valor)
+    raise ValueError(f"formato desconhecido: {como!r}")
+
+
+def _fatorial_formatado(args):
+    n, como = args
+    return _formatar(math.factorial(n), como)
+
+
+class MotorFatorial:
+    def __init__(self, workers=None, cache_bytes=256 * 2**20, limiar_paralelo=50_000):
+        self.workers = workers or os.cpu_count() or 1
+        self.cache_bytes = cache_bytes
+        self.limiar_paralelo = limiar_paralelo
+        self._cache = OrderedDict()  # n -> n!
+        self._chaves = []             # ns em cache, ordenados (para bisect)
+        self._bytes = 0
+        self._executor = None
+
+    @property
+    def executor(self):
+        if self._executor is None:  # criado sob demanda e reaproveitado
+            self._executor = ProcessPoolExecutor(self.workers)
+        return self._executor
+
+    def fechar(self):
+        if self._executor is not None:
+            self._executor.shutdown()
+            self._executor = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *args):
+        self.fechar()
+
+    def _guardar(self, n, valor):
+        tamanho = valor.bit_length() // 8
+        if n in self._cache or tamanho > self.cache_bytes:
+            return
+        self._cache[n] = valor
+        bisect.insort(self._chaves, n)
+        self._bytes += tamanho
+        while self._bytes > self.cache_bytes:
+            antigo, v = self._cache.popitem(last=False)
+            self._chaves.remove(antigo)
+            self._bytes -= v.bit_length() // 8
+
+    def _produto_paralelo(self, fatores):
+        if len(fatores) < 2 * self.workers:
+            return _produto(fatores)
+        # fatias intercaladas: p**e grandes (primos pequenos) ficam espalhados
+        fatias = [fatores[i::self.workers] for i in range(self.workers)]
+        return _produto(self.executor.map(_produto, fatias))
+
+    def _fatorial(self, n, primos):
+        if n in self._cache:
+            self._cache.move_to_end(n)
+            return self._cache[n]
+        i = bisect.bisect_right(self._chaves, n) - 1
+        if i >= 0 and n - self._chaves[i] < n // 8:  # cauda curta: m! · (m+1)···n
+            m = self._chaves[i]
+            valor = self._cache[m] * _produto_intervalo(m + 1, n)
+        elif n < 64:
+            valor = math.factorial(n)
+        else:
+            metade = self._fatorial(n // 2, primos)
+            fatores = _fatores_swing(n, primos)
+            swing = (self._produto_paralelo(fatores) if n >= self.limiar_paralelo
+                     else _produto(fatores))
+            valor = metade * metade * swing
+        self._guardar(n, valor)
+        return valor
+
+    def fatorial(self, n, como="int"):
+        if n < 0:
+            raise ValueError("n deve ser >= 0")
+        return _formatar(self._fatorial(n, _primos_ate(n)), como)
+
+    def binomial(self, n, k, como="int"):
+        if not 0 <= k <= n:
+            return _formatar(0, como)
+        if n in self._cache and k in self._cache and n - k in self._cache:
+            valor = self._cache[n] // (self._cache[k] * self._cache[n - k])
+        else:
+            valor = math.comb(n, k)
+        return _formatar(valor, como)
+
+    def fatoriais(self, ns, como="digitos"):
+        """Vários fatoriais em paralelo; a conversão acontece no worker, e só o
+        resultado já formatado (str/bytes) volta pelo pickle"""
+        return list(self.executor.map(_fatorial_formatado, [(n, como) for n in ns]))
+
+
+def benchmark_fatorial(n=150_000):
+    inicio = time.perf_counter()
+    referencia = math.factorial(n)
+    t_math = time.perf_counter() - inicio
+
+    with MotorFatorial() as motor:
+        inicio = time.perf_counter()
+        valor = motor.fatorial(n)
+        t_motor = time.perf_counter() - inicio
+        assert valor == referencia
+
+        inicio = time.perf_counter()
+        motor.fatorial(n + 100)  # reaproveita n! do cache
+        t_cache = time.perf_counter() - inicio
+
+        inicio = time.perf_counter()
+        digitos = motor.fatorial(n, como="digitos")
+        t_digitos = time.perf_counter() - inicio
+
+    print(f"math.factorial({n}): {t_math:.3f}s")
+    print(f"prime swing paralelo: {t_motor:.3f}s | {n + 100}! via cache: {t_cache:.4f}s")
+    print(f"{len(digitos)} dígitos em {t_digitos:.3f}s (str() leva segundos)")
+
+
+# if __name__ == "__main__":
+#     benchmark_fatorial()
+
+
 # 3. Asyncio com Tasks
 async def monitorar_tarefas():
     tarefa1 = asyncio.create_task(download("https://example.com"))
@@ -149,6 +535,152 @@ with concurrent.futures.ThreadPoolExecutor(max_workers=5) as executor:
         except Exception as e:
             print(f"Erro em {url}: {e}")
 
+
+# Scraper em dois estágios
+# No scrape() acima, requests.get e o BeautifulSoup dividem as mesmas 5 threads,
+# e o parsing (CPU) disputa o GIL com a espera de rede. Aqui:
+# - estágio 1 (asyncio): N tarefas de fetch com uma sessão compartilhada
+# - fila limitada entre os estágios: se o parsing atrasar, o fetch espera
+# - estágio 2 (ProcessPoolExecutor): extração por regex dos campos comuns,
+#   bem mais barata que montar a árvore DOM inteira
+# - resultados saem conforme ficam prontos, com métricas de vazão por estágio
+import html as html_lib
+import re
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+_TITULO = re.compile(rb"<title[^>]*>(.*?)</title>", re.I | re.S)
+_DESCRICAO = re.compile(
+    rb"<meta\s[^>]*name=[\"']description[\"'][^>]*content=[\"']([^\"']*)", re.I)
+_LINKS = re.compile(rb"<a\s[^>]*href=[\"']([^\"'#]+)", re.I)
+
+
+def extrair_campos(corpo: bytes, encoding="utf-8"):
+    """Título, descrição e links de uma página (roda nos processos worker)"""
+
+    def texto(match):
+        if match is None:
+            return None
+        return html_lib.unescape(match.group(1).decode(encoding, "replace")).strip()
+
+    return {
+        "title": texto(_TITULO.search(corpo)),
+        "description": texto(_DESCRICAO.search(corpo)),
+        "links": [link.decode(encoding, "replace") for link in _LINKS.findall(corpo)],
+    }
+
+
+class MetricasEtapa:
+    def __init__(self, nome):
+        self.nome = nome
+        self.itens = 0
+        self.bytes = 0
+        self.erros = 0
+        self.inicio = time.perf_counter()
+
+    def vazao(self):
+        decorrido = time.perf_counter() - self.inicio
+        return self.itens / decorrido if decorrido else 0.0
+
+    def __repr__(self):
+        return (f"{self.nome}: {self.itens} itens, {self.bytes / 2**20:.1f} MiB, "
+                f"{self.erros} erros, {self.vazao():.1f} itens/s")
+
+
+class ScraperPipeline:
+    def __init__(self, fetchers=20, parsers=None, capacidade=100, extrator=extrair_campos):
+        self.fetchers = fetchers
+        self.parsers = parsers or os.cpu_count() or 1
+        self.capacidade = capacidade
+        self.extrator = extrator  # precisa ser picklable (função de módulo)
+        self.metricas = {"fetch": MetricasEtapa("fetch"), "parse": MetricasEtapa("parse")}
+
+    async def _buscar(self, session, urls, paginas):
+        fetch = self.metricas["fetch"]
+        while urls:
+            url = urls.pop()
+            try:
+                async with session.get(url) as response:
+                    response.raise_for_status()
+                    corpo = await response.read()
+            except (aiohttp.ClientError, asyncio.TimeoutError) as e:
+                fetch.erros += 1
+                await paginas.put((url, None, e))
+                continue
+            fetch.itens += 1
+            fetch.bytes += len(corpo)
+            await paginas.put((url, corpo, None))  # bloqueia se a fila estiver cheia
+
+    async def _analisar(self, executor, paginas, saida):
+        loop = asyncio.get_running_loop()
+        parse = self.metricas["parse"]
+        limite = asyncio.Semaphore(2 * self.parsers)  # mantém os workers ocupados
+        tarefas = set()
+
+        async def um(url, corpo):
+            try:
+                campos = await loop.run_in_executor(executor, self.extrator, corpo)
+            except Exception as e:
+                parse.erros += 1
+                await saida.put((url, e))
+            else:
+                parse.itens += 1
+                parse.bytes += len(corpo)
+                await saida.put((url, campos))
+            finally:
+                limite.release()
+
+        while (item := await paginas.get()) is not None:
+            url, corpo, erro = item
+            if erro is not None:
+                await saida.put((url, erro))
+                continue
+            await limite.acquire()
+            tarefa = asyncio.create_task(um(url, corpo))
+            tarefas.add(tarefa)
+            tarefa.add_done_callback(tarefas.discard)
+        await asyncio.gather(*tarefas)
+        await saida.put(None)
+
+    async def executar(self, urls, session=None):
+        """Gera (url, campos) ou (url, exceção) conforme cada página termina"""
+        urls = list(reversed(urls))
+        paginas = asyncio.Queue(maxsize=self.capacidade)
+        saida = asyncio.Queue()
+        propria = session is None
+        session = session or aiohttp.ClientSession()
+        executor = ProcessPoolExecutor(self.parsers)
+        for metrica in self.metricas.values():
+            metrica.inicio = time.perf_counter()
+        tarefas = []
+        try:
+            buscadores = [asyncio.create_task(self._buscar(session, urls, paginas))
+                          for _ in range(self.fetchers)]
+            tarefas += buscadores
+            tarefas.append(asyncio.create_task(self._finalizar(buscadores, paginas)))
+            tarefas.append(asyncio.create_task(self._analisar(executor, paginas, saida)))
+            while (resultado := await saida.get()) is not None:
+                yield resultado
+            await asyncio.gather(*tarefas)
+        finally:
+            for tarefa in tarefas:  # consumidor parou antes do fim: cancela o resto
+                tarefa.cancel()
+            executor.shutdown(wait=False, cancel_futures=True)
+            if propria:
+                await session.close()
+
+    @staticmethod
+    async def _finalizar(buscadores, paginas):
+        await asyncio.gather(*buscadores)
+        await paginas.put(None)  # sinaliza o fim para o estágio de parsing
+
+
+# async def raspar(urls):
+#     pipeline = ScraperPipeline(fetchers=50)
+#     async for url, campos in pipeline.executar(urls):
+#         print(url, campos if isinstance(campos, Exception) else campos["title"])
+#     print(*pipeline.metricas.values(), sep="\n")
+
 # 2. Processamento de Imagens Paralelo
 from multiprocessing import Pool
 
@@ -169,6 +701,224 @@ if __name__ == "__main__":
         results = pool.map(process_image, images)
     print(f"Imagens processadas: {results}")
 
+
+# Serviço de processamento de imagens em lote
+# Pool(processes=len(images)) cria um processo por imagem: inviável com 50k.
+# Aqui:
+# - Pool de tamanho fixo + imap_unordered sobre um os.walk lazy
+# - cada worker reaproveita seu buffer de leitura (o hash e o decoder leem
+#   direto dele, sem cópia do arquivo); a imagem é decodificada uma
+#   vez (JPEG já reduzido via draft() quando o 1º filtro é um resize), passa
+#   por toda a cadeia de filtros e é codificada uma vez
+# - manifesto JSON no destino: pula imagens com mesmo mtime/tamanho (ou, com
+#   usar_hash=True, mesmo conteúdo) e mesma cadeia de filtros
+# - destino mantém a extensão de origem quando ela difere do formato de saída
+#   (foto.png -> foto.png.jpg), então foto.jpg e foto.png não colidem
+# - progresso periódico (feitas, puladas, erros, imagens/s)
+import hashlib
+import io
+import json
+import time
+
+EXTENSOES = {".jpg", ".jpeg", ".png", ".webp", ".bmp", ".tif", ".tiff"}
+_SUFIXOS = {"JPEG": ".jpg", "PNG": ".png", "WEBP": ".webp"}
+
+
+class Desfocar:
+    def __init__(self, raio=2):
+        self.raio = raio
+
+    def __call__(self, img):
+        return img.filter(ImageFilter.GaussianBlur(radius=self.raio))
+
+    def __repr__(self):
+        return f"Desfocar({self.raio})"
+
+
+class Redimensionar:
+    def __init__(self, max_lado):
+        self.max_lado = max_lado
+
+    def rascunho(self, img):
+        img.draft(img.mode, (self.max_lado, self.max_lado))  # só tem efeito em JPEG
+
+    def __call__(self, img):
+        img.thumbnail((self.max_lado, self.max_lado))  # in-place, mantém proporção
+        return img
+
+    def __repr__(self):
+        return f"Redimensionar({self.max_lado})"
+
+
+class ConverterModo:
+    def __init__(self, modo="RGB"):
+        self.modo = modo
+
+    def __call__(self, img):
+        return img if img.mode == self.modo else img.convert(self.modo)
+
+    def __repr__(self):
+        return f"ConverterModo({self.modo!r})"
+
+
+_buffer = bytearray(4 * 2**20)  # buffer de leitura de cada processo worker
+
+
+def _ler(caminho):
+    global _buffer
+    tamanho = os.path.getsize(caminho)
+    if tamanho > len(_buffer):
+        _buffer = bytearray(tamanho * 2)
+    with open(caminho, "rb") as f:
+        lidos = f.readinto(memoryview(_buffer)[:tamanho])
+    return memoryview(_buffer)[:lidos]
+
+
+class _LeitorMemoria(io.RawIOBase):
+    """Arquivo somente leitura sobre um memoryview (io.BytesIO copiaria os bytes)"""
+
+    def __init__(self, dados):
+        self._dados = dados
+        self._pos = 0
+
+    def readable(self):
+        return True
+
+    def seekable(self):
+        return True
+
+    def readinto(self, destino):
+        n = max(0, min(len(destino), len(self._dados) - self._pos))
+        destino[:n] = self._dados[self._pos:self._pos + n]
+        self._pos += n
+        return n
+
+    def seek(self, pos, whence=io.SEEK_SET):
+        base = {io.SEEK_SET: 0, io.SEEK_CUR: self._pos, io.SEEK_END: len(self._dados)}[whence]
+        self._pos = max(0, base + pos)
+        return self._pos
+
+    def tell(self):
+        return self._pos
+
+
+def _processar_imagem(tarefa):
+    rel, origem, destino, filtros, formato, qualidade, usar_hash, hash_anterior = tarefa
+    try:
+        dados = _ler(origem)
+        digest = hashlib.blake2b(dados, digest_size=16).hexdigest() if usar_hash else None
+        if digest is not None and digest == hash_anterior and os.path.exists(destino):
+            return rel, destino, digest, "pulada", None
+        with Image.open(io.BufferedReader(_LeitorMemoria(dados))) as img:
+            if filtros and hasattr(filtros[0], "rascunho"):
+                filtros[0].rascunho(img)
+            img.load()
+            for filtro in filtros:
+                img = filtro(img)
+            if formato == "JPEG" and img.mode not in ("RGB", "L"):
+                img = img.convert("RGB")
+            os.makedirs(os.path.dirname(destino), exist_ok=True)
+            temporario = destino + ".tmp"
+            img.save(temporario, format=formato, quality=qualidade)
+        os.replace(temporario, destino)  # nunca deixa um arquivo pela metade
+        return rel, destino, digest, "feita", None
+    except Exception as e:  # uma imagem ruim não derruba o lote
+        return rel, destino, None, "erro", repr(e)
+
+
+class ProcessadorImagens:
+    MANIFESTO = ".manifesto.json"
+
+    def __init__(self, origem, destino, filtros=(Desfocar(2),), formato="JPEG",
+                 qualidade=85, workers=None, usar_hash=False, progresso_a_cada=100):
+        self.origem = origem
+        self.destino = destino
+        self.filtros = tuple(filtros)
+        self.formato = formato
+        self.qualidade = qualidade
+        self.workers = workers or os.cpu_count() or 1
+        self.usar_hash = usar_hash
+        self.progresso_a_cada = progresso_a_cada
+        self.assinatura = f"{self.filtros!r}|{formato}|{qualidade}"
+        self.contagem = {"feita": 0, "pulada": 0, "erro": 0}
+        caminho = os.path.join(destino, self.MANIFESTO)
+        try:
+            with open(caminho) as f:
+                self.manifesto = json.load(f)
+        except FileNotFoundError:
+            self.manifesto = {}
+        self.colisoes = {}  # rel -> destino já usado por outra imagem
+
+    def _salvar_manifesto(self):
+        os.makedirs(self.destino, exist_ok=True)
+        caminho = os.path.join(self.destino, self.MANIFESTO)
+        with open(caminho + ".tmp", "w") as f:
+            json.dump(self.manifesto, f)
+        os.replace(caminho + ".tmp", caminho)
+
+    def _tarefas(self):
+        sufixo = _SUFIXOS.get(self.formato, "." + self.formato.lower())
+        destinos = {}
+        for raiz, _, arquivos in os.walk(self.origem):
+            for nome in sorted(arquivos):
+                if os.path.splitext(nome)[1].lower() not in EXTENSOES:
+                    continue
+                origem = os.path.join(raiz, nome)
+                rel = os.path.relpath(origem, self.origem)
+                base, extensao = os.path.splitext(rel)
+                saida = base + sufixo if extensao.lower() == sufixo else rel + sufixo
+                destino = os.path.join(self.destino, saida)
+                if destino in destinos:  # ex.: foto.png e foto.png.jpg
+                    self.colisoes[rel] = f"destino {saida!r} já usado por {destinos[destino]!r}"
+                    continue
+                destinos[destino] = rel
+                st = os.stat(origem)
+                anterior = self.manifesto.get(rel)
+                if anterior and anterior["assinatura"] != self.assinatura:
+                    anterior = None
+                if (anterior and anterior["mtime_ns"] == st.st_mtime_ns
+                        and anterior["tamanho"] == st.st_size and os.path.exists(destino)):
+                    self.contagem["pulada"] += 1  # só um stat(), sem abrir o arquivo
+                    continue
+                hash_anterior = anterior["hash"] if anterior else None
+                yield (rel, origem, destino, self.filtros, self.formato,
+                       self.qualidade, self.usar_hash, hash_anterior)
+
+    def _progresso(self, inicio):
+        feitas, puladas, erros = (self.contagem[k] for k in ("feita", "pulada", "erro"))
+        taxa = feitas / (time.perf_counter() - inicio or 1e-9)
+        print(f"{feitas} feitas, {puladas} puladas, {erros} erros ({taxa:.1f} img/s)")
+
+    def executar(self):
+        inicio = time.perf_counter()
+        erros = {}
+        with Pool(self.workers) as pool:
+            resultados = pool.imap_unordered(_processar_imagem, self._tarefas(), chunksize=8)
+            for i, (rel, destino, digest, estado, erro) in enumerate(resultados, 1):
+                self.contagem[estado] += 1
+                if estado == "erro":
+                    erros[rel] = erro
+                else:
+                    st = os.stat(os.path.join(self.origem, rel))
+                    self.manifesto[rel] = {
+                        "mtime_ns": st.st_mtime_ns, "tamanho": st.st_size,
+                        "hash": digest, "assinatura": self.assinatura,
+                    }
+                if i % self.progresso_a_cada == 0:
+                    self._progresso(inicio)
+                    self._salvar_manifesto()  # checkpoint: retoma de onde parou
+        erros.update(self.colisoes)
+        self.contagem["erro"] += len(self.colisoes)
+        self._salvar_manifesto()
+        self._progresso(inicio)
+        return erros
+
+
+# if __name__ == "__main__":
+#     ProcessadorImagens("fotos/", "processadas/",
+#                        filtros=[Redimensionar(1024), Desfocar(2)],
+#                        formato="WEBP").executar()
+
 # Exercício Prático
 
 # Implemente um sistema que:
@@ -190,11 +940,222 @@ import requests
 # 4. Coordene tudo em uma função main()
 
 
-def main():
-    urls = ["https://api.example.com/data/1", "https://api.example.com/data/2"]
+import inspect
+import time
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+
+# Executor híbrido: I/O em threads (ou no event loop), CPU em processos
+# - buscar: função de I/O; se for "async def" roda no event loop, senão num
+#   ThreadPoolExecutor
+# - processar: função CPU-bound (picklable) enviada ao ProcessPoolExecutor via
+#   loop.run_in_executor
+# - filas limitadas entre os estágios: o estágio mais lento freia os anteriores
+# - metricas() é um retrato instantâneo; monitorar() imprime periodicamente
+
+
+_FIM = object()  # sentinela de fim de fila
+
+
+class EstagioMetricas:
+    def __init__(self, nome):
+        self.nome = nome
+        self.concluidos = 0
+        self.erros = 0
+        self.em_andamento = 0
+        self.ocupado = 0.0  # soma dos tempos das tarefas (s)
+
+
+class ExecutorHibrido:
+    def __init__(self, buscar, processar, io_workers=16, cpu_workers=None, capacidade=32):
+        self.buscar = buscar
+        self.processar = processar
+        self.io_workers = io_workers
+        self.cpu_workers = cpu_workers or os.cpu_count() or 1
+        self.capacidade = capacidade
+        self.estagios = {"io": EstagioMetricas("io"), "cpu": EstagioMetricas("cpu")}
+        self._filas = {}
+        self._inicio = None
+        self.terminado = False
+
+    def metricas(self):
+        decorrido = time.perf_counter() - self._inicio if self._inicio else 0.0
+        retrato = {"decorrido": decorrido}
+        for nome, estagio in self.estagios.items():
+            retrato[nome] = {
+                "concluidos": estagio.concluidos,
+                "erros": estagio.erros,
+                "em_andamento": estagio.em_andamento,
+                "vazao": estagio.concluidos / decorrido if decorrido else 0.0,
+                "utilizacao": estagio.ocupado / decorrido if decorrido else 0.0,
+            }
+        retrato["filas"] = {nome: fila.qsize() for nome, fila in self._filas.items()}
+        return retrato
+
+    async def monitorar(self, intervalo=0.5, saida=print):
+        while not self.terminado:
+            await asyncio.sleep(intervalo)
+            m = self.metricas()
+            saida(f"[{m['decorrido']:6.1f}s] "
+                  f"io {m['io']['concluidos']} ({m['io']['vazao']:.0f}/s) | "
+                  f"cpu {m['cpu']['concluidos']} ({m['cpu']['vazao']:.0f}/s) | "
+                  f"filas {m['filas']}")
+
+    async def _medir(self, estagio, corrotina):
+        estagio.em_andamento += 1
+        inicio = time.perf_counter()
+        try:
+            resultado = await corrotina
+        except Exception:
+            estagio.erros += 1
+            raise
+        else:
+            estagio.concluidos += 1
+            return resultado
+        finally:
+            estagio.em_andamento -= 1
+            estagio.ocupado += time.perf_counter() - inicio
+
+    async def _etapa(self, entrada, saida, executar, estagio, workers):
+        async def worker():
+            while (item := await entrada.get()) is not _FIM:
+                try:
+                    resultado = await self._medir(estagio, executar(item))
+                except Exception as e:
+                    resultado = e
+                await saida.put((item, resultado))
+
+        await asyncio.gather(*(worker() for _ in range(workers)))
+        await saida.put((_FIM, None))
+
+    async def executar(self, itens):
+        """Gera (item, resultado) conforme terminam; falhas voltam como exceções"""
+        loop = asyncio.get_running_loop()
+        entrada = asyncio.Queue(self.capacidade)
+        fila_io = asyncio.Queue(self.capacidade)
+        para_cpu = asyncio.Queue(self.capacidade)
+        saida = asyncio.Queue(self.capacidade)
+        self._filas = {"entrada": entrada, "io": fila_io, "cpu": para_cpu, "saida": saida}
+        self._inicio = time.perf_counter()
+        self.terminado = False
+
+        threads = ThreadPoolExecutor(self.io_workers)
+        processos = ProcessPoolExecutor(self.cpu_workers)
+
+        def buscar(item):
+            if inspect.iscoroutinefunction(self.buscar):
+                return self.buscar(item)
+            return loop.run_in_executor(threads, self.buscar, item)
+
+        async def alimentar():
+            for item in itens:
+                await entrada.put(item)
+            for _ in range(self.io_workers):
+                await entrada.put(_FIM)
+
+        async def repassar(fila_io):
+            # Resultados de I/O seguem para a CPU; falhas de I/O vão direto à saída
+            while (par := await fila_io.get())[0] is not _FIM:
+                item, resultado = par
+                if isinstance(resultado, Exception):
+                    await saida.put(((item, None), resultado))
+                else:
+                    await para_cpu.put((item, resultado))
+            for _ in range(self.cpu_workers):
+                await para_cpu.put(_FIM)
+
+        def processar(par):
+            return loop.run_in_executor(processos, self.processar, par[1])
+
+        tarefas = [
+            asyncio.create_task(alimentar()),
+            asyncio.create_task(self._etapa(entrada, fila_io, buscar,
+                                            self.estagios["io"], self.io_workers)),
+            asyncio.create_task(repassar(fila_io)),
+            asyncio.create_task(self._etapa(para_cpu, saida, processar,
+                                            self.estagios["cpu"], self.cpu_workers)),
+        ]
+        try:
+            while (par := await saida.get())[0] is not _FIM:
+                (item, _), resultado = par
+                yield item, resultado
+            await asyncio.gather(*tarefas)
+        finally:
+            self.terminado = True
+            for tarefa in tarefas:
+                tarefa.cancel()
+            threads.shutdown(wait=False, cancel_futures=True)
+            processos.shutdown(wait=False, cancel_futures=True)
 
-    # Implementação aqui
-    pass
+
+# 1. Função para buscar dados (threading)
+_sessao = threading.local()  # uma requests.Session (keep-alive) por thread
+
+
+def buscar_dados(url):
+    if not hasattr(_sessao, "s"):
+        _sessao.s = requests.Session()
+    response = _sessao.s.get(url, timeout=10)
+    response.raise_for_status()
+    return response.content
+
+
+# 2. Função para processar dados (multiprocessing)
+def processar_dados(conteudo):
+    dados = json.loads(conteudo)
+    valores = dados.get("valores", [])
+    return {"n": len(valores), "soma": sum(v * v for v in valores)}
+
+
+# 3./4. Monitor assíncrono + coordenação
+async def executar_hibrido(urls, io_workers=16, cpu_workers=None, intervalo=0.5):
+    executor = ExecutorHibrido(buscar_dados, processar_dados, io_workers, cpu_workers)
+    monitor = asyncio.create_task(executor.monitorar(intervalo))
+    resultados = {}
+    try:
+        async for url, resultado in executor.executar(urls):
+            resultados[url] = resultado
+    finally:
+        monitor.cancel()
+    return resultados, executor.metricas()
+
+
+# Benchmark contra um servidor HTTP local (sequencial vs híbrido)
+async def benchmark_hibrido(n=200, valores=20_000):
+    corpo = json.dumps({"valores": list(range(valores))}).encode()
+
+    async def servir(request):
+        await asyncio.sleep(0.01)  # latência simulada
+        return web.Response(body=corpo, content_type="application/json")
+
+    app = web.Application()
+    app.router.add_get("/data/{i}", servir)
+    runner = web.AppRunner(app)
+    await runner.setup()
+    sock = socket.socket()
+    sock.bind(("127.0.0.1", 0))
+    await web.SockSite(runner, sock).start()
+    urls = [f"http://127.0.0.1:{sock.getsockname()[1]}/data/{i}" for i in range(n)]
+    try:
+        inicio = time.perf_counter()
+        for url in urls:  # sequencial (em thread, para não travar o servidor)
+            await asyncio.to_thread(lambda u=url: processar_dados(buscar_dados(u)))
+        t_seq = time.perf_counter() - inicio
+
+        inicio = time.perf_counter()
+        resultados, metricas = await executar_hibrido(urls, intervalo=1.0)
+        t_hib = time.perf_counter() - inicio
+        assert len(resultados) == n
+        print(f"sequencial: {t_seq:.2f}s | híbrido: {t_hib:.2f}s ({t_seq / t_hib:.1f}x)")
+        print(metricas)
+    finally:
+        await runner.cleanup()
+
+
+def main():
+    # api.example.com do enunciado não existe: roda contra o servidor local.
+    # Com uma API real:
+    # resultados, metricas = asyncio.run(executar_hibrido(urls))
+    asyncio.run(benchmark_hibrido())
 
 
 if __name__ == "__main__":
@@ -80,14 +80,24 @@ import time
 
 
 class Timer:
+    def __init__(self, nome="bloco", profiler=None):
+        self.nome = nome
+        self.profiler = profiler  # se informado, registra em vez de imprimir
+
     def __enter__(self):
+        if self.profiler is not None:
+            self._span = self.profiler.span(self.nome)
+            self._span.__enter__()
         self.start = time.perf_counter()
         return self
 
     def __exit__(self, *args):
         self.end = time.perf_counter()
         self.elapsed = self.end - self.start
-        print(f"Tempo decorrido: {self.elapsed:.6f} segundos")
+        if self.profiler is not None:
+            self._span.__exit__(*args)
+        else:
+            print(f"Tempo decorrido: {self.elapsed:.6f} segundos")
 
 
 with Timer():
@@ -95,6 +105,170 @@ with Timer():
     sum(x * x for x in range(1_000_000))
 
 
+# Profiler hierárquico de baixo custo
+# Timer imprime uma vez por uso: inútil dentro de laços quentes. O Profiler:
+# - usa perf_counter_ns (inteiros, resolução de nanossegundos)
+# - aninha spans numa árvore (pilha por thread): "main;parse;tokenize"
+# - guarda as últimas `capacidade` durações de cada nome num buffer
+#   pré-alocado (array de int64 circular) para p50/p99 sem alocar por amostra
+# - desativado, span() devolve um context manager nulo compartilhado
+# - exporta no formato "folded stacks" (flamegraph.pl, speedscope, inferno)
+import threading
+from array import array
+from collections import defaultdict
+from functools import wraps
+
+
+class _SpanNulo:
+    __slots__ = ()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *args):
+        return False
+
+
+_SPAN_NULO = _SpanNulo()
+
+
+class _Histograma:
+    __slots__ = ("amostras", "contagem", "total_ns", "maximo_ns")
+
+    def __init__(self, capacidade):
+        self.amostras = array("q", bytes(8 * capacidade))
+        self.contagem = 0
+        self.total_ns = 0
+        self.maximo_ns = 0
+
+    def registrar(self, ns):
+        self.amostras[self.contagem % len(self.amostras)] = ns
+        self.contagem += 1
+        self.total_ns += ns
+        if ns > self.maximo_ns:
+            self.maximo_ns = ns
+
+    def percentil(self, p):
+        n = min(self.contagem, len(self.amostras))
+        if n == 0:
+            return 0
+        ordenadas = sorted(self.amostras[:n])
+        return ordenadas[min(n - 1, int(p / 100 * n))]
+
+
+class _Span:
+    __slots__ = ("profiler", "nome", "inicio", "filhos_ns")
+
+    def __init__(self, profiler, nome):
+        self.profiler = profiler
+        self.nome = nome
+
+    def __enter__(self):
+        self.filhos_ns = 0
+        self.profiler._pilha().append(self)
+        self.inicio = time.perf_counter_ns()
+        return self
+
+    def __exit__(self, *args):
+        duracao = time.perf_counter_ns() - self.inicio
+        profiler = self.profiler
+        pilha = profiler._pilha()
+        caminho = ";".join(span.nome for span in pilha)
+        pilha.pop()
+        if pilha:
+            pilha[-1].filhos_ns += duracao
+        profiler._registrar(self.nome, caminho, duracao, duracao - self.filhos_ns)
+        return False
+
+
+class Profiler:
+    def __init__(self, capacidade=4096, ativo=True):
+        self.capacidade = capacidade
+        self.ativo = ativo
+        self._local = threading.local()
+        self._lock = threading.Lock()
+        self.histogramas = {}
+        self.pilhas = defaultdict(int)  # caminho -> tempo próprio (ns)
+
+    def _pilha(self):
+        try:
+            return self._local.pilha
+        except AttributeError:
+            self._local.pilha = []
+            return self._local.pilha
+
+    def _registrar(self, nome, caminho, duracao, proprio):
+        with self._lock:
+            histograma = self.histogramas.get(nome)
+            if histograma is None:
+                histograma = self.histogramas[nome] = _Histograma(self.capacidade)
+            histograma.registrar(duracao)
+            self.pilhas[caminho] += proprio
+
+    def span(self, nome):
+        if not self.ativo:
+            return _SPAN_NULO
+        return _Span(self, nome)
+
+    def medir(self, nome=None):
+        """Decorator: cada chamada vira um span (custo ~zero quando inativo)"""
+
+        def decorator(func):
+            rotulo = nome or func.__qualname__
+
+            @wraps(func)
+            def wrapper(*args, **kwargs):
+                if not self.ativo:
+                    return func(*args, **kwargs)
+                with _Span(self, rotulo):
+                    return func(*args, **kwargs)
+
+            return wrapper
+
+        return decorator
+
+    def relatorio(self):
+        """Linhas (nome, chamadas, total_ms, p50_us, p99_us, max_us), pelo total"""
+        with self._lock:
+            itens = list(self.histogramas.items())
+        linhas = [
+            (nome, h.contagem, h.total_ns / 1e6, h.percentil(50) / 1e3,
+             h.percentil(99) / 1e3, h.maximo_ns / 1e3)
+            for nome, h in itens
+        ]
+        return sorted(linhas, key=lambda linha: linha[2], reverse=True)
+
+    def imprimir(self):
+        print(f"{'span':<24}{'chamadas':>10}{'total ms':>12}{'p50 µs':>10}{'p99 µs':>10}{'max µs':>10}")
+        for nome, n, total, p50, p99, maximo in self.relatorio():
+            print(f"{nome:<24}{n:>10}{total:>12.3f}{p50:>10.2f}{p99:>10.2f}{maximo:>10.2f}")
+
+    def exportar_folded(self, caminho):
+        """Formato folded stacks: 'a;b;c <microssegundos próprios>' por linha"""
+        with self._lock, open(caminho, "w") as f:
+            for pilha, ns in sorted(self.pilhas.items()):
+                if ns >= 1000:
+                    f.write(f"{pilha} {ns // 1000}\n")
+
+
+profiler = Profiler()
+
+
+@profiler.medir()
+def passo(i):
+    with profiler.span("quadrado"):
+        return i * i
+
+
+with Timer("laco", profiler):
+    for i in range(10_000):
+        passo(i)
+
+profiler.imprimir()
+# profiler.exportar_folded("perfil.folded")  ->  flamegraph.pl perfil.folded > perfil.svg
+# profiler.ativo = False  # em produção: span() vira um objeto nulo compartilhado
+
+
 # Transaction Management
 class Transaction:
     def __init__(self, db):
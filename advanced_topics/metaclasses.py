@@ -114,10 +114,66 @@ print(db1 is db2)  # True
 
 
 # Exemplo Avançado: ORM Simples
+# Persistência real em sqlite3:
+# - tipos Python mapeados para tipos SQL
+# - SQL de INSERT/SELECT montado uma única vez, na criação da classe; como o
+#   texto é sempre o mesmo, o cache de statements do sqlite3 (cached_statements)
+#   reaproveita o statement já compilado (equivalente a um prepared statement)
+# - bulk_insert: executemany sobre um gerador, numa única transação
+# - select: cursor com fetchmany, a tabela nunca é carregada inteira
+# Objetos de linha leves:
+# - a metaclasse gera __slots__ com as colunas (sem __dict__ por linha)
+# - identity map: WeakValueDictionary por classe, chave = (conexão, primary
+#   key); get() de uma linha já viva devolve a mesma instância, sem consultar
+#   o banco (a instância referencia a conexão, então o id(conn) não é reusado)
+# - Field(..., lazy=True): a coluna fica fora do SELECT e é carregada no
+#   primeiro acesso ao atributo
+import sqlite3
+import time
+import weakref
+from itertools import islice
+
+TIPOS_SQL = {int: "INTEGER", float: "REAL", str: "TEXT", bytes: "BLOB", bool: "INTEGER"}
+
+
 class Field:
-    def __init__(self, type_, primary_key=False):
+    def __init__(self, type_, primary_key=False, lazy=False):
+        if type_ not in TIPOS_SQL:
+            raise TypeError(f"tipo sem mapeamento SQL: {type_.__name__}")
+        if primary_key and lazy:
+            raise ValueError("a primary key não pode ser lazy")
         self.type_ = type_
         self.primary_key = primary_key
+        self.lazy = lazy
+
+    @property
+    def sql_type(self):
+        return TIPOS_SQL[self.type_]
+
+
+class _ColunaLazy:
+    """Descriptor: busca a coluna no banco no primeiro acesso e guarda no slot"""
+
+    def __init__(self, nome, sql):
+        self.nome = nome
+        self.slot = f"_lazy_{nome}"
+        self.sql = sql
+
+    def __get__(self, obj, tipo=None):
+        if obj is None:
+            return self
+        try:
+            return getattr(obj, self.slot)
+        except AttributeError:
+            if obj._conn is None:  # objeto novo, ainda não salvo
+                return None
+            row = obj._conn.execute(self.sql, (getattr(obj, obj._pk),)).fetchone()
+            valor = None if row is None else row[0]
+            setattr(obj, self.slot, valor)
+            return valor
+
+    def __set__(self, obj, valor):
+        setattr(obj, self.slot, valor)
 
 
 class ModelMeta(type):
@@ -130,20 +186,122 @@ class ModelMeta(type):
         namespace["_fields"] = fields
         namespace["_tablename"] = name.lower()
 
+        pks = [k for k, f in fields.items() if f.primary_key]
+        pk = namespace["_pk"] = pks[0] if pks else None
+        imediatos = [k for k, f in fields.items() if not f.lazy]
+        if pk is None and len(imediatos) < len(fields):
+            # a carga lazy busca a coluna pela primary key (WHERE pk = ?)
+            raise TypeError(f"{name}: campos lazy exigem uma primary key")
+        colunas = ", ".join(fields)
+        marcadores = ", ".join("?" for _ in fields)
+        selecionadas = ", ".join(imediatos)
+        namespace["_imediatos"] = tuple(imediatos)
+        namespace["_pk_indice"] = imediatos.index(pk) if pk else None
+        namespace["_sql"] = {
+            "insert": f"INSERT INTO {name.lower()} ({colunas}) VALUES ({marcadores})",
+            "select": f"SELECT {selecionadas} FROM {name.lower()}",
+            "get": f"SELECT {selecionadas} FROM {name.lower()} WHERE {pk} = ?" if pk else None,
+        }
+
+        if "__slots__" not in namespace:
+            # Os Field saem da classe: o nome passa a ser um slot (ou descriptor lazy)
+            for k in fields:
+                del namespace[k]
+            namespace["__slots__"] = tuple(imediatos) + tuple(
+                f"_lazy_{k}" for k, f in fields.items() if f.lazy)
+            for k, f in fields.items():
+                if f.lazy:
+                    namespace[k] = _ColunaLazy(k, f"SELECT {k} FROM {name.lower()} WHERE {pk} = ?")
+            namespace["_identidades"] = weakref.WeakValueDictionary()
+
         return super().__new__(mcls, name, bases, namespace)
 
 
 class Model(metaclass=ModelMeta):
+    __slots__ = ("_conn", "__weakref__")
+
+    def __init__(self, **valores):
+        self._conn = None
+        for nome in self._fields:
+            setattr(self, nome, valores.get(nome))
+
+    def __repr__(self):
+        campos = ", ".join(f"{k}={getattr(self, k)!r}" for k in self._fields)
+        return f"{type(self).__name__}({campos})"
+
     @classmethod
     def create_table_sql(cls):
         columns = []
         for name, field in cls._fields.items():
-            col = f"{name} {field.type_.__name__}"
+            col = f"{name} {field.sql_type}"
             if field.primary_key:
                 col += " PRIMARY KEY"
             columns.append(col)
         return f"CREATE TABLE {cls._tablename} ({', '.join(columns)})"
 
+    @classmethod
+    def create_table(cls, conn):
+        conn.execute(cls.create_table_sql().replace("CREATE TABLE", "CREATE TABLE IF NOT EXISTS", 1))
+
+    @classmethod
+    def _para_tupla(cls, obj):
+        if isinstance(obj, dict):
+            return tuple(obj.get(nome) for nome in cls._fields)
+        if isinstance(obj, Model):
+            return tuple(getattr(obj, nome) for nome in cls._fields)
+        return tuple(obj)  # já na ordem das colunas
+
+    @classmethod
+    def _from_row(cls, row, conn):
+        if cls._pk is not None:
+            chave = (id(conn), row[cls._pk_indice])
+            existente = cls._identidades.get(chave)
+            if existente is not None:
+                return existente
+        obj = cls.__new__(cls)
+        obj._conn = conn
+        for nome, valor in zip(cls._imediatos, row):
+            setattr(obj, nome, valor)
+        if cls._pk is not None:
+            cls._identidades[chave] = obj
+        return obj
+
+    def save(self, conn):
+        with conn:
+            conn.execute(self._sql["insert"], self._para_tupla(self))
+        self._conn = conn
+        if self._pk is not None:
+            self._identidades[(id(conn), getattr(self, self._pk))] = self
+
+    @classmethod
+    def bulk_insert(cls, conn, linhas):
+        """Insere um iterável (tuplas, dicts ou instâncias) numa única transação"""
+        with conn:
+            cursor = conn.executemany(cls._sql["insert"], map(cls._para_tupla, linhas))
+        return cursor.rowcount
+
+    @classmethod
+    def get(cls, conn, pk):
+        if cls._pk is None:
+            raise TypeError(f"{cls.__name__} não tem primary key")
+        existente = cls._identidades.get((id(conn), pk))
+        if existente is not None:  # já vivo em memória: nenhuma consulta
+            return existente
+        row = conn.execute(cls._sql["get"], (pk,)).fetchone()
+        return None if row is None else cls._from_row(row, conn)
+
+    @classmethod
+    def select(cls, conn, where=None, params=(), lote=1000):
+        """Gera instâncias em lotes de `lote` linhas (fetchmany)"""
+        sql = cls._sql["select"] if where is None else f"{cls._sql['select']} WHERE {where}"
+        cursor = conn.execute(sql, params)
+        try:
+            while linhas := cursor.fetchmany(lote):
+                for row in linhas:
+                    yield cls._from_row(row, conn)
+        finally:
+            cursor.close()
+
 
 class User(Model):
     id = Field(int, primary_key=True)
@@ -152,7 +310,57 @@ class User(Model):
 
 
 print(User.create_table_sql())
-# CREATE TABLE user (id int PRIMARY KEY, name str, age int)
+# CREATE TABLE user (id INTEGER PRIMARY KEY, name TEXT, age INTEGER)
+
+conn = sqlite3.connect(":memory:")
+User.create_table(conn)
+User(id=1, name="Alice", age=30).save(conn)
+User.bulk_insert(conn, [(2, "Bob", 25), {"id": 3, "name": "Carol", "age": 41}])
+print(User.get(conn, 3))  # User(id=3, name='Carol', age=41)
+print([u.name for u in User.select(conn, "age > ?", (26,))])  # ['Alice', 'Carol']
+
+carol = User.get(conn, 3)
+print(carol is User.get(conn, 3))  # True: mesma instância, sem nova consulta
+# carol.__dict__  -> AttributeError: só __slots__
+
+
+class Artigo(Model):
+    id = Field(int, primary_key=True)
+    titulo = Field(str)
+    corpo = Field(str, lazy=True)  # texto grande: fora do SELECT
+
+
+Artigo.create_table(conn)
+Artigo.bulk_insert(conn, [(1, "Metaclasses", "..." * 10_000)])
+titulos = [a.titulo for a in Artigo.select(conn)]  # não lê `corpo`
+print(len(Artigo.get(conn, 1).corpo))  # 30000, carregado agora
+
+
+def benchmark_orm(n=200_000):
+    conn = sqlite3.connect(":memory:")
+    User.create_table(conn)
+    linhas = ((i, f"user{i}", i % 90) for i in range(n))
+
+    inicio = time.perf_counter()
+    for i, nome, idade in islice(linhas, n // 10):  # uma transação por linha
+        User(id=i, name=nome, age=idade).save(conn)
+    t_save = time.perf_counter() - inicio
+
+    inicio = time.perf_counter()
+    User.bulk_insert(conn, linhas)  # o resto, numa transação
+    t_bulk = time.perf_counter() - inicio
+
+    inicio = time.perf_counter()
+    total = sum(1 for _ in User.select(conn, lote=5000))
+    t_select = time.perf_counter() - inicio
+
+    print(f"save():        {n // 10 / t_save:>10,.0f} linhas/s")
+    print(f"bulk_insert(): {(n - n // 10) / t_bulk:>10,.0f} linhas/s")
+    print(f"select():      {total / t_select:>10,.0f} linhas/s")
+
+
+if __name__ == "__main__":
+    benchmark_orm()
 
 # Quando Não Usar Metaclasses
 # - Quando decorators são suficientes
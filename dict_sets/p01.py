@@ -67,6 +67,199 @@ def fib(n, cache={0: 0, 1: 1}):
         cache[n] = fib(n-1) + fib(n-2)
     return cache[n]
 
+# Problemas do cache acima:
+# - cresce para sempre e é compartilhado implicitamente (default mutável)
+# - fib(5000) estoura o limite de recursão
+# - não é seguro entre threads nem mede nada
+
+# Memoização limitada, com política de remoção e métricas
+# - politica="lru" (menos recente) ou "lfu" (menos frequente), ambas O(1)
+# - ttl: entradas expiram após `ttl` segundos
+# - lock striping: o cache é dividido em shards, cada um com seu lock,
+#   então threads com chaves diferentes raramente disputam o mesmo lock
+# - bottom_up: para funções recursivas, aquece o cache em ordem crescente,
+#   de modo que cada chamada recursiva vira um hit (profundidade 1), mesmo
+#   que outras threads removam essas entradas do cache compartilhado
+import threading
+import time
+from collections import OrderedDict, defaultdict, namedtuple
+from functools import wraps
+
+InfoCache = namedtuple("InfoCache", ["hits", "misses", "evictions", "tamanho", "maxsize"])
+_AUSENTE = object()
+
+
+class _ShardLRU:
+    def __init__(self, maxsize):
+        self.maxsize = maxsize
+        self.lock = threading.Lock()
+        self.dados = OrderedDict()  # chave -> (valor, expira)
+        self.hits = self.misses = self.evictions = 0
+
+    def get(self, chave, agora):
+        entrada = self.dados.get(chave)
+        if entrada is not None and (entrada[1] is None or entrada[1] > agora):
+            self.hits += 1
+            self._tocar(chave)
+            return entrada[0]
+        if entrada is not None:  # expirada
+            self._remover(chave)
+            self.evictions += 1
+        self.misses += 1
+        return _AUSENTE
+
+    def put(self, chave, valor, expira):
+        if chave in self.dados:
+            self.dados[chave] = (valor, expira)
+            self._tocar(chave)
+            return
+        if self.maxsize is not None and len(self.dados) >= self.maxsize:
+            self._remover_vitima()
+            self.evictions += 1
+        self.dados[chave] = (valor, expira)
+        self._inserir(chave)
+
+    def _tocar(self, chave):
+        self.dados.move_to_end(chave)
+
+    def _inserir(self, chave):
+        pass  # OrderedDict já coloca a chave no fim
+
+    def _remover(self, chave):
+        del self.dados[chave]
+
+    def _remover_vitima(self):
+        self.dados.popitem(last=False)
+
+
+class _ShardLFU(_ShardLRU):
+    # Buckets de frequência: freq -> chaves em ordem de chegada (desempate por LRU)
+    def __init__(self, maxsize):
+        super().__init__(maxsize)
+        self.dados = {}
+        self.freq = {}
+        self.buckets = defaultdict(OrderedDict)
+        self.min_freq = 0
+
+    def _tocar(self, chave):
+        f = self.freq[chave]
+        del self.buckets[f][chave]
+        if not self.buckets[f]:
+            del self.buckets[f]
+            if self.min_freq == f:
+                self.min_freq = f + 1
+        self.freq[chave] = f + 1
+        self.buckets[f + 1][chave] = None
+
+    def _inserir(self, chave):
+        self.freq[chave] = 1
+        self.buckets[1][chave] = None
+        self.min_freq = 1
+
+    def _remover(self, chave):
+        f = self.freq.pop(chave)
+        del self.dados[chave]
+        del self.buckets[f][chave]
+        if not self.buckets[f]:
+            del self.buckets[f]
+            if self.min_freq == f:  # raro (só em expiração): recalcula
+                self.min_freq = min(self.buckets, default=0)
+
+    def _remover_vitima(self):
+        chave, _ = self.buckets[self.min_freq].popitem(last=False)
+        if not self.buckets[self.min_freq]:
+            del self.buckets[self.min_freq]
+        del self.dados[chave]
+        del self.freq[chave]
+
+
+def _chave(args, kwargs):
+    return args + tuple(sorted(kwargs.items())) if kwargs else args
+
+
+def memoizar(maxsize=128, politica="lru", ttl=None, shards=8, bottom_up=None):
+    """Decorator de memoização limitada e thread-safe
+
+    bottom_up: função que recebe os mesmos argumentos e devolve os argumentos
+    menores a calcular antes (ex.: lambda n: range(n) para fib)
+    """
+    classes = {"lru": _ShardLRU, "lfu": _ShardLFU}
+    if politica not in classes:
+        raise ValueError(f"política desconhecida: {politica!r}")
+    if maxsize is not None:  # dividido entre os shards (arredondado para cima)
+        shards = max(1, min(shards, maxsize))
+    por_shard = None if maxsize is None else -(-maxsize // shards)
+
+    def decorator(func):
+        tabela = [classes[politica](por_shard) for _ in range(shards)]
+        # Rascunho por thread durante o aquecimento: os valores calculados ficam
+        # nele até o fim da chamada de topo, então o evict de outra thread no
+        # cache compartilhado não faz a recursão voltar a ficar profunda
+        local = threading.local()
+
+        @wraps(func)
+        def wrapper(*args, **kwargs):
+            chave = _chave(args, kwargs)
+            rascunho = getattr(local, "rascunho", None)
+            if rascunho is not None and chave in rascunho:
+                return rascunho[chave]
+            shard = tabela[hash(chave) % shards]
+            agora = time.monotonic() if ttl is not None else 0
+            with shard.lock:
+                valor = shard.get(chave, agora)
+            if valor is not _AUSENTE:
+                if rascunho is not None:
+                    rascunho[chave] = valor
+                return valor
+
+            topo = rascunho is None and bottom_up is not None
+            if topo:
+                rascunho = local.rascunho = {}
+            try:
+                if topo:
+                    for menor in bottom_up(*args, **kwargs):
+                        wrapper(menor)
+                # A função roda fora do lock: recursão e outras threads não bloqueiam
+                valor = func(*args, **kwargs)
+            finally:
+                if topo:
+                    local.rascunho = None
+            if rascunho is not None:
+                rascunho[chave] = valor
+            with shard.lock:
+                shard.put(chave, valor, time.monotonic() + ttl if ttl is not None else None)
+            return valor
+
+        def info():
+            hits = misses = evictions = tamanho = 0
+            for shard in tabela:
+                with shard.lock:
+                    hits += shard.hits
+                    misses += shard.misses
+                    evictions += shard.evictions
+                    tamanho += len(shard.dados)
+            return InfoCache(hits, misses, evictions, tamanho, maxsize)
+
+        def limpar():
+            for i, shard in enumerate(tabela):
+                with shard.lock:
+                    tabela[i] = classes[politica](por_shard)
+
+        wrapper.cache_info = info
+        wrapper.cache_clear = limpar
+        return wrapper
+
+    return decorator
+
+
+@memoizar(maxsize=256, bottom_up=lambda n: range(n))
+def fib_memo(n):
+    return n if n < 2 else fib_memo(n - 1) + fib_memo(n - 2)
+
+
+print(fib_memo(10_000) % 10**10)  # sem RecursionError e com no máximo 256 entradas
+print(fib_memo.cache_info())
+
 
 # Contagem eficiente
 from collections import Counter
@@ -74,6 +267,208 @@ from collections import Counter
 contagem = Counter("abracadabra")
 # Counter({'a': 5, 'b': 2, 'r': 2, 'c': 1, 'd': 1})
 
+# Contagem em streaming para corpora maiores que a RAM
+# - o iterável é consumido em lotes (islice), sem carregar tudo
+# - cada lote é contado num processo worker, já dividido em shards
+#   (hash estável crc32: o mesmo token cai no mesmo shard em qualquer processo)
+# - o processo principal junta os shards; acima de `max_chaves` despeja
+#   (spill) os shards em disco, e o resultado final junta um shard por vez
+# - modo aproximado: Count-Min Sketch, memória constante e erro limitado;
+#   cada worker mantém o próprio sketch e devolve só os top_k do lote, e no
+#   fim os sketches são somados (tabelas com as mesmas funções de hash)
+import heapq
+import math
+import multiprocessing
+import os
+import pickle
+import tempfile
+import zlib
+from itertools import islice
+from multiprocessing import Pool
+
+
+def _shard_de(token, n_shards):
+    dados = token.encode() if isinstance(token, str) else repr(token).encode()
+    return zlib.crc32(dados) % n_shards
+
+
+def _contar_lote(args):
+    lote, n_shards = args
+    shards = [{} for _ in range(n_shards)]
+    for token, n in Counter(lote).items():
+        shards[_shard_de(token, n_shards)][token] = n
+    return shards
+
+
+_sketch_worker = None
+_barreira = None
+
+
+def _iniciar_worker_aproximado(epsilon, delta, barreira):
+    global _sketch_worker, _barreira
+    _sketch_worker = CountMinSketch(epsilon, delta)
+    _barreira = barreira
+
+
+def _contar_lote_aproximado(args):
+    lote, top_k = args
+    contagem = Counter(lote)
+    for token, n in contagem.items():
+        _sketch_worker.adicionar(token, n)
+    return heapq.nlargest(top_k, contagem.items(), key=lambda kv: kv[1])
+
+
+def _entregar_sketch(_):
+    # A barreira prende cada worker até todos chegarem: uma tarefa por worker
+    _barreira.wait()
+    return _sketch_worker
+
+
+def _lotes(iteravel, tamanho):
+    it = iter(iteravel)
+    while lote := list(islice(it, tamanho)):
+        yield lote
+
+
+class CountMinSketch:
+    """Estimativa >= contagem real e, com prob. 1 - delta, <= real + epsilon * total"""
+
+    def __init__(self, epsilon=1e-4, delta=1e-3):
+        self.largura = math.ceil(math.e / epsilon)
+        self.profundidade = math.ceil(math.log(1 / delta))
+        self.tabela = [[0] * self.largura for _ in range(self.profundidade)]
+        self.total = 0
+
+    def _posicoes(self, token):
+        dados = token.encode() if isinstance(token, str) else repr(token).encode()
+        return [zlib.crc32(dados, semente) % self.largura
+                for semente in range(1, self.profundidade + 1)]
+
+    def adicionar(self, token, n=1):
+        self.total += n
+        for linha, pos in zip(self.tabela, self._posicoes(token)):
+            linha[pos] += n
+
+    def estimar(self, token):
+        return min(linha[pos] for linha, pos in zip(self.tabela, self._posicoes(token)))
+
+    def somar(self, outro):
+        """Junta um sketch de mesma largura/profundidade (ex.: de outro processo)"""
+        if (outro.largura, outro.profundidade) != (self.largura, self.profundidade):
+            raise ValueError("sketches com dimensões diferentes")
+        self.tabela = [[a + b for a, b in zip(minha, dela)]
+                       for minha, dela in zip(self.tabela, outro.tabela)]
+        self.total += outro.total
+
+
+class ContadorStreaming:
+    def __init__(self, workers=None, lote=100_000, n_shards=16,
+                 max_chaves=5_000_000, dir_spill=None, aproximado=False,
+                 top_k=100, epsilon=1e-4, delta=1e-3):
+        self.workers = workers or os.cpu_count() or 1
+        self.lote = lote
+        self.n_shards = n_shards
+        self.max_chaves = max_chaves
+        self.dir_spill = dir_spill
+        self.shards = [Counter() for _ in range(n_shards)]
+        self._spills = 0
+        self._dir_temporario = None
+        self.aproximado = aproximado
+        if aproximado:
+            self.epsilon, self.delta = epsilon, delta
+            self.sketch = CountMinSketch(epsilon, delta)
+            self.top_k = top_k
+            self._parciais = Counter()  # candidatos -> soma das contagens por lote
+            self._candidatos = {}       # top_k tokens -> estimativa do sketch
+
+    def consumir(self, iteravel):
+        if self.aproximado:
+            return self._consumir_aproximado(iteravel)
+        tarefas = ((lote, self.n_shards) for lote in _lotes(iteravel, self.lote))
+        with Pool(self.workers) as pool:
+            for shards in pool.imap_unordered(_contar_lote, tarefas):
+                for destino, parcial in zip(self.shards, shards):
+                    destino.update(parcial)
+                if sum(map(len, self.shards)) > self.max_chaves:
+                    self._spill()
+        return self
+
+    def _consumir_aproximado(self, iteravel):
+        # O processo principal só recebe top_k tokens por lote; o sketch
+        # inteiro atravessa o IPC uma vez por worker, no final
+        tarefas = ((lote, self.top_k) for lote in _lotes(iteravel, self.lote))
+        limite = 10 * self.top_k
+        barreira = multiprocessing.Barrier(self.workers)
+        with Pool(self.workers, initializer=_iniciar_worker_aproximado,
+                  initargs=(self.epsilon, self.delta, barreira)) as pool:
+            for melhores in pool.imap_unordered(_contar_lote_aproximado, tarefas):
+                self._parciais.update(dict(melhores))
+                if len(self._parciais) > 2 * limite:  # poda amortizada, não por token
+                    self._parciais = Counter(dict(self._parciais.most_common(limite)))
+            for sketch in pool.map(_entregar_sketch, range(self.workers), chunksize=1):
+                self.sketch.somar(sketch)
+        estimativas = ((token, self.sketch.estimar(token)) for token in self._parciais)
+        self._candidatos = dict(heapq.nlargest(self.top_k, estimativas, key=lambda kv: kv[1]))
+        return self
+
+    def _arquivo(self, i):
+        return os.path.join(self.dir_spill, f"shard_{i:04d}.pkl")
+
+    def _spill(self):
+        if self.dir_spill is None:
+            self.dir_spill = self._dir_temporario = tempfile.mkdtemp(prefix="contador_")
+        for i, shard in enumerate(self.shards):
+            with open(self._arquivo(i), "ab") as f:  # anexa um dict por spill
+                pickle.dump(dict(shard), f, protocol=pickle.HIGHEST_PROTOCOL)
+            shard.clear()
+        self._spills += 1
+
+    def _shard_completo(self, i):
+        total = Counter(self.shards[i])
+        if self._spills:
+            with open(self._arquivo(i), "rb") as f:
+                while True:
+                    try:
+                        total.update(pickle.load(f))
+                    except EOFError:
+                        break
+        return total
+
+    def items(self):
+        """Gera (token, contagem) exatos, com apenas um shard em memória por vez"""
+        if self.aproximado:
+            raise ValueError("modo aproximado não guarda todas as chaves")
+        for i in range(self.n_shards):
+            yield from self._shard_completo(i).items()
+
+    def mais_comuns(self, k=10):
+        if self.aproximado:
+            return heapq.nlargest(k, self._candidatos.items(), key=lambda kv: kv[1])
+        return heapq.nlargest(k, self.items(), key=lambda kv: kv[1])
+
+    def limpar(self):
+        """Remove os arquivos de spill (e o diretório, se foi criado aqui)"""
+        if self._spills:
+            for i in range(self.n_shards):
+                os.remove(self._arquivo(i))
+        if self._dir_temporario is not None:
+            os.rmdir(self._dir_temporario)
+            self.dir_spill = self._dir_temporario = None
+        self._spills = 0
+        self.shards = [Counter() for _ in range(self.n_shards)]
+
+
+# Uso
+# def tokens(caminho):
+#     with open(caminho) as f:
+#         for linha in f:
+#             yield from linha.split()
+#
+# if __name__ == "__main__":
+#     contador = ContadorStreaming(max_chaves=2_000_000).consumir(tokens("corpus.txt"))
+#     print(contador.mais_comuns(20))
+#     aprox = ContadorStreaming(aproximado=True, top_k=20).consumir(tokens("corpus.txt"))
+
 # Dicionarios como registros
 from types import SimpleNamespace
 
@@ -85,6 +480,144 @@ print(obj.nome) # João
 lista = [1, 2, 2, 3, 3, 3]
 unicos = list(set(lista)) # [1, 2, 3]
 
+# list(set(...)) perde a ordem e exige tudo em memória.
+# Em memória e com ordem: list(dict.fromkeys(lista))  # [1, 2, 3]
+
+# Deduplicação em streaming (estágio de pipeline lazy)
+# - preserva a ordem da primeira ocorrência
+# - guarda só fingerprints de 64 bits (blake2b), não os itens
+# - acima de `max_memoria` fingerprints, despeja para um arquivo ordenado e
+#   imutável em disco (run), consultado via mmap + busca binária; runs de
+#   tamanho parecido são mescladas em níveis (como numa LSM-tree), então cada
+#   fingerprint é regravado O(log(N / max_memoria)) vezes, não a cada despejo
+# - bloom=True: memória constante, mas pode descartar itens únicos com
+#   probabilidade ~`erro` (nunca deixa passar duplicados)
+import hashlib
+import mmap
+import struct
+from array import array
+from bisect import bisect_left
+
+
+def _bytes_de(item):
+    if isinstance(item, bytes):
+        return item
+    return item.encode() if isinstance(item, str) else repr(item).encode()
+
+
+def _fingerprint(item):
+    return int.from_bytes(hashlib.blake2b(_bytes_de(item), digest_size=8).digest(), "little")
+
+
+class FiltroBloom:
+    def __init__(self, capacidade, erro=1e-3):
+        self.m = max(8, math.ceil(-capacidade * math.log(erro) / math.log(2) ** 2))
+        self.k = max(1, round(self.m / capacidade * math.log(2)))
+        self.bits = bytearray((self.m + 7) // 8)
+
+    def adicionar(self, item):
+        """Marca o item; retorna True se ele (provavelmente) já estava presente"""
+        digest = hashlib.blake2b(_bytes_de(item), digest_size=16).digest()
+        h1, h2 = struct.unpack("<QQ", digest)
+        presente = True
+        for i in range(self.k):  # double hashing: h1 + i*h2
+            pos = (h1 + i * h2) % self.m
+            byte, bit = divmod(pos, 8)
+            if not self.bits[byte] >> bit & 1:
+                presente = False
+                self.bits[byte] |= 1 << bit
+        return presente
+
+
+class _Run:
+    """Fingerprints ordenados num arquivo temporário, lidos via mmap"""
+
+    def __init__(self, ordenados, dir_spill=None):
+        fd, self.caminho = tempfile.mkstemp(prefix="dedup_", suffix=".u64", dir=dir_spill)
+        with os.fdopen(fd, "wb") as f:
+            buffer = array("Q")
+            for fp in ordenados:
+                buffer.append(fp)
+                if len(buffer) >= 65_536:
+                    buffer.tofile(f)
+                    del buffer[:]
+            buffer.tofile(f)
+        self._arquivo = open(self.caminho, "rb")
+        self._mmap = mmap.mmap(self._arquivo.fileno(), 0, access=mmap.ACCESS_READ)
+        self.dados = memoryview(self._mmap).cast("Q")
+
+    def __len__(self):
+        return len(self.dados)
+
+    def __contains__(self, fp):
+        i = bisect_left(self.dados, fp)
+        return i < len(self.dados) and self.dados[i] == fp
+
+    def fechar(self):
+        self.dados.release()
+        self._mmap.close()
+        self._arquivo.close()
+        os.remove(self.caminho)
+
+
+class _FingerprintsEmDisco:
+    def __init__(self, max_memoria, dir_spill=None):
+        self.max_memoria = max_memoria
+        self.memoria = set()
+        self.dir_spill = dir_spill
+        self.runs = []  # da mais antiga (maior) para a mais nova
+
+    def __contains__(self, fp):
+        return fp in self.memoria or any(fp in run for run in self.runs)
+
+    def adicionar(self, fp):
+        self.memoria.add(fp)
+        if len(self.memoria) >= self.max_memoria:
+            self._spill()
+
+    def _spill(self):
+        self.runs.append(_Run(sorted(self.memoria), self.dir_spill))
+        self.memoria.clear()
+        # Como um contador binário: mescla enquanto a penúltima run não for
+        # maior que a última (conjuntos disjuntos, já ordenados)
+        while len(self.runs) >= 2 and len(self.runs[-2]) <= len(self.runs[-1]):
+            nova, antiga = self.runs.pop(), self.runs.pop()
+            self.runs.append(_Run(heapq.merge(antiga.dados, nova.dados), self.dir_spill))
+            antiga.fechar()
+            nova.fechar()
+
+    def fechar(self):
+        for run in self.runs:
+            run.fechar()
+        self.runs.clear()
+
+
+def deduplicar(itens, chave=None, max_memoria=1_000_000, dir_spill=None,
+               bloom=False, capacidade=10_000_000, erro=1e-3):
+    """Gera cada item na primeira vez que sua chave aparece"""
+    if bloom:
+        filtro = FiltroBloom(capacidade, erro)
+        for item in itens:
+            if not filtro.adicionar(item if chave is None else chave(item)):
+                yield item
+        return
+
+    vistos = _FingerprintsEmDisco(max_memoria, dir_spill)
+    try:
+        for item in itens:
+            fp = _fingerprint(item if chave is None else chave(item))
+            if fp not in vistos:
+                vistos.adicionar(fp)
+                yield item
+    finally:  # também roda se o consumidor abandonar o generator
+        vistos.fechar()
+
+
+print(list(deduplicar([3, 1, 3, 2, 1])))  # [3, 1, 2]
+
+# No pipeline lazy de generators_yield/p01.py:
+# pipeline = numerar(deduplicar(filtrar_vazias(ler_arquivo("dados.txt"))))
+
 # Perfomance considerations
 # - Dicionarios e sets são O(1) para operações básicas (em média)
 # - A partir do python 3.6, dicionarios usam menos memória
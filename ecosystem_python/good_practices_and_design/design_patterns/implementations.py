@@ -98,8 +98,552 @@ class Repository(ABC):
     def update(self, id: str, entity: Dict) -> bool:
         pass
 
+    @abstractmethod
+    def delete(self, id: str) -> bool:
+        pass
+
 
 # Implemente:
 # 1. InMemoryRepository
 # 2. Um repositório que alterna entre backends
 # 3. Testes unitários para sua implementação
+
+# 1. InMemoryRepository com índices secundários
+# - índice hash (campo -> valor -> ids): igualdade em O(1)
+# - índice ordenado (lista de (valor, id)): igualdade e intervalos via bisect,
+#   O(log n); inserções vão para um buffer e o índice é reordenado na
+#   próxima consulta (timsort em dados quase ordenados é barato)
+# - planner: para filtros em conjunção, estima quantos ids cada índice
+#   devolveria e usa o mais seletivo; os demais filtros viram verificação
+import bisect
+import time
+import uuid
+from collections import defaultdict
+from typing import Any, Iterator, List, Tuple
+
+
+class Entre:
+    """Filtro de intervalo: minimo <= valor <= maximo (None = sem limite)"""
+
+    def __init__(self, minimo=None, maximo=None):
+        self.minimo = minimo
+        self.maximo = maximo
+
+    def aceita(self, valor) -> bool:
+        if valor is None:
+            return False
+        return ((self.minimo is None or valor >= self.minimo)
+                and (self.maximo is None or valor <= self.maximo))
+
+    def __repr__(self):
+        return f"Entre({self.minimo!r}, {self.maximo!r})"
+
+
+def _valor(par):
+    return par[0]
+
+
+class _IndiceOrdenado:
+    def __init__(self):
+        self.pares: List[Tuple[Any, str]] = []
+        self.pendentes: List[Tuple[Any, str]] = []
+
+    def adicionar(self, valor, id: str) -> None:
+        self.pendentes.append((valor, id))
+
+    def remover(self, valor, id: str) -> None:
+        self._consolidar()
+        i = bisect.bisect_left(self.pares, (valor, id))
+        if i < len(self.pares) and self.pares[i] == (valor, id):
+            del self.pares[i]
+
+    def _consolidar(self) -> None:
+        if self.pendentes:
+            self.pares.extend(self.pendentes)
+            self.pendentes.clear()
+            self.pares.sort()
+
+    def _limites(self, filtro) -> Tuple[int, int]:
+        self._consolidar()
+        pares = self.pares
+        if not isinstance(filtro, Entre):
+            filtro = Entre(filtro, filtro)
+        inicio = (0 if filtro.minimo is None
+                  else bisect.bisect_left(pares, filtro.minimo, key=_valor))
+        fim = (len(pares) if filtro.maximo is None
+               else bisect.bisect_right(pares, filtro.maximo, lo=inicio, key=_valor))
+        return inicio, fim
+
+    def estimar(self, filtro) -> int:
+        inicio, fim = self._limites(filtro)
+        return fim - inicio
+
+    def ids(self, filtro) -> Iterator[str]:
+        inicio, fim = self._limites(filtro)
+        return (id for _, id in self.pares[inicio:fim])
+
+
+class InMemoryRepository(Repository):
+    def __init__(self, hash_indices=(), sorted_indices=()):
+        self._dados: Dict[str, Dict] = {}
+        self._hash = {campo: defaultdict(set) for campo in hash_indices}
+        self._ordenados = {campo: _IndiceOrdenado() for campo in sorted_indices}
+
+    def __len__(self):
+        return len(self._dados)
+
+    def _indexar(self, id: str, entity: Dict) -> None:
+        for campo, indice in self._hash.items():
+            if campo in entity:
+                indice[entity[campo]].add(id)
+        for campo, indice in self._ordenados.items():
+            if entity.get(campo) is not None:
+                indice.adicionar(entity[campo], id)
+
+    def _desindexar(self, id: str, entity: Dict) -> None:
+        for campo, indice in self._hash.items():
+            if campo in entity:
+                ids = indice[entity[campo]]
+                ids.discard(id)
+                if not ids:
+                    del indice[entity[campo]]
+        for campo, indice in self._ordenados.items():
+            if entity.get(campo) is not None:
+                indice.remover(entity[campo], id)
+
+    def add(self, entity: Dict) -> str:
+        id = entity.get("id")
+        id = uuid.uuid4().hex if id is None else str(id)  # id 0 é válido
+        if id in self._dados:
+            raise KeyError(f"id duplicado: {id}")
+        entity = {**entity, "id": id}
+        self._dados[id] = entity
+        self._indexar(id, entity)
+        return id
+
+    def get(self, id: str) -> Optional[Dict]:
+        entity = self._dados.get(id)
+        return None if entity is None else dict(entity)  # cópia: índices ficam íntegros
+
+    def update(self, id: str, entity: Dict) -> bool:
+        antigo = self._dados.get(id)
+        if antigo is None:
+            return False
+        novo = {**entity, "id": id}
+        self._desindexar(id, antigo)
+        self._dados[id] = novo
+        self._indexar(id, novo)
+        return True
+
+    def delete(self, id: str) -> bool:
+        entity = self._dados.pop(id, None)
+        if entity is None:
+            return False
+        self._desindexar(id, entity)
+        return True
+
+    def _estimativa(self, campo, filtro) -> Tuple[float, str]:
+        if filtro is None:  # campo ausente ou None: nenhum índice guarda esses ids
+            return float("inf"), "varredura"
+        if campo in self._hash and not isinstance(filtro, Entre):
+            return len(self._hash[campo].get(filtro, ())), "hash"
+        if campo in self._ordenados:
+            return self._ordenados[campo].estimar(filtro), "ordenado"
+        return float("inf"), "varredura"
+
+    def explicar(self, **filtros) -> List[Tuple[str, str, float]]:
+        """Plano: (campo, tipo de acesso, linhas estimadas), do mais seletivo ao menos"""
+        plano = [(campo, *reversed(self._estimativa(campo, filtro)))
+                 for campo, filtro in filtros.items()]
+        return sorted(plano, key=lambda passo: passo[2])
+
+    def find(self, **filtros) -> List[Dict]:
+        """Entidades que satisfazem todos os filtros (valor exato ou Entre)"""
+        if not filtros:
+            return [dict(e) for e in self._dados.values()]
+        campo, acesso, _ = self.explicar(**filtros)[0]
+        if acesso == "hash":
+            candidatos = iter(self._hash[campo].get(filtros[campo], ()))
+        elif acesso == "ordenado":
+            candidatos = self._ordenados[campo].ids(filtros[campo])
+        else:
+            candidatos = iter(self._dados)
+        restantes = [(c, f) for c, f in filtros.items() if c != campo or acesso == "varredura"]
+        resultado = []
+        for id in candidatos:
+            entity = self._dados[id]
+            if all(f.aceita(entity.get(c)) if isinstance(f, Entre) else entity.get(c) == f
+                   for c, f in restantes):
+                resultado.append(dict(entity))
+        return resultado
+
+
+# 2. FileRepository: backend em arquivo (append-only, com write-ahead log)
+# - cada escrita vira um registro [tamanho, crc32, op, payload JSON] no fim do log
+# - group commit: uma thread escritora junta os registros pendentes de várias
+#   chamadas, faz um único write() + fsync() e só então libera quem esperava
+# - índice em memória id -> (offset, tamanho): get() é um único pread()
+# - compactação em segundo plano: reescreve só os registros vivos num arquivo
+#   novo a partir de um snapshot; leituras continuam no arquivo antigo e só o
+#   swap final (cópia da cauda + os.replace) segura os locks
+# - checkpoint: o índice é salvo periodicamente junto com o offset coberto;
+#   na recuperação, só a parte do log depois do checkpoint é relida, e um
+#   registro final incompleto (crash no meio do write) é truncado
+import json
+import logging
+import os
+import struct
+import threading
+import zlib
+from concurrent.futures import Future
+
+_CABECALHO = struct.Struct("<IIB")  # tamanho do payload, crc32, operação
+_PUT, _DELETE = 1, 2
+_log = logging.getLogger(__name__)
+
+
+def _registro(op: int, payload: bytes) -> bytes:
+    return _CABECALHO.pack(len(payload), zlib.crc32(bytes([op]) + payload), op) + payload
+
+
+def _escrever_tudo(fd: int, dados: bytes) -> None:
+    vista = memoryview(dados)
+    while vista:  # os.write pode gravar só parte (ex.: disco quase cheio)
+        vista = vista[os.write(fd, vista):]
+
+
+def _ler_registros(dados: bytes, base: int = 0):
+    """Gera (op, offset do payload, payload) até o fim ou até o 1º registro inválido"""
+    pos = 0
+    while pos + _CABECALHO.size <= len(dados):
+        tamanho, crc, op = _CABECALHO.unpack_from(dados, pos)
+        inicio = pos + _CABECALHO.size
+        payload = dados[inicio:inicio + tamanho]
+        if len(payload) < tamanho or zlib.crc32(bytes([op]) + payload) != crc:
+            return
+        yield op, base + inicio, payload
+        pos = inicio + tamanho
+
+
+class FileRepository(Repository):
+    def __init__(self, caminho: str, grupo_s: float = 0.002,
+                 checkpoint_a_cada: int = 50_000, compactar_acima: float = 0.5):
+        self.caminho = caminho
+        self.grupo_s = grupo_s
+        self.checkpoint_a_cada = checkpoint_a_cada
+        self.compactar_acima = compactar_acima  # fração de lixo que dispara compactação
+        self._lock = threading.Lock()       # índice, fd de leitura, estado lógico
+        self._escrita = threading.Lock()    # append no log (e o swap da compactação)
+        self._checkpointando = threading.Lock()  # escritor e compactação gravam o mesmo .ckpt
+        self._cond = threading.Condition()
+        self._fila: List[Tuple[int, str, bytes, Future]] = []
+        self._fechando = False
+        self._erro = None  # falha de escrita que deixou o log em estado desconhecido
+        self._compactando = None
+        self._desde_checkpoint = 0
+        self._recuperar()
+        self._thread = threading.Thread(target=self._escritor, daemon=True)
+        self._thread.start()
+
+    # Recuperação
+    def _carregar_checkpoint(self) -> Tuple[Dict[str, Tuple[int, int]], int]:
+        try:
+            with open(self.caminho + ".ckpt") as f:
+                ckpt = json.load(f)
+            st = os.stat(self.caminho)
+            if ckpt["inode"] == st.st_ino and ckpt["offset"] <= st.st_size:
+                return {id: tuple(pos) for id, pos in ckpt["indice"].items()}, ckpt["offset"]
+        except (FileNotFoundError, ValueError, KeyError):
+            pass
+        return {}, 0  # checkpoint ausente ou de outro arquivo: relê o log todo
+
+    def _recuperar(self) -> None:
+        open(self.caminho, "ab").close()
+        self._indice, offset = self._carregar_checkpoint()
+        with open(self.caminho, "rb") as f:
+            f.seek(offset)
+            cauda = f.read()
+        fim = offset
+        for op, inicio, payload in _ler_registros(cauda, offset):
+            self._aplicar(op, inicio, payload)
+            fim = inicio + len(payload)
+        if fim < offset + len(cauda):
+            os.truncate(self.caminho, fim)  # registro incompleto de um crash
+        self._tamanho = fim
+        self._vivos = sum(n + _CABECALHO.size for _, n in self._indice.values())
+        self._ids = set(self._indice)
+        self._arquivo = open(self.caminho, "ab", buffering=0)
+        self._fd = os.open(self.caminho, os.O_RDONLY)
+
+    def _aplicar(self, op: int, inicio: int, payload: bytes, indice=None) -> None:
+        indice = self._indice if indice is None else indice
+        if op == _PUT:
+            id = json.loads(payload)["id"]
+            indice[id] = (inicio, len(payload))
+        else:
+            indice.pop(payload.decode(), None)
+
+    # Escrita (group commit)
+    def _enfileirar(self, op: int, id: str, payload: bytes) -> Future:
+        futuro: Future = Future()
+        with self._cond:
+            if self._fechando:
+                raise RuntimeError("repositório fechado")
+            if self._erro is not None:
+                raise RuntimeError("repositório só leitura após falha de escrita") from self._erro
+            self._fila.append((op, id, payload, futuro))
+            self._cond.notify()
+        return futuro
+
+    def _escritor(self) -> None:
+        lote = []
+        try:
+            while True:
+                with self._cond:
+                    while not self._fila and not self._fechando:
+                        self._cond.wait()
+                    if not self._fila:
+                        return
+                if self.grupo_s:
+                    time.sleep(self.grupo_s)  # janela para juntar mais escritas
+                with self._cond:
+                    lote, self._fila = self._fila, []
+                self._gravar(lote)
+                lote = []
+        except BaseException as e:
+            # Sem escritor ninguém resolveria os futures: falha tudo e recusa novas escritas
+            _log.exception("thread escritora de %s terminou", self.caminho)
+            with self._cond:
+                self._erro = e
+                pendentes, self._fila = lote + self._fila, []
+            for *_, futuro in pendentes:
+                if not futuro.done():
+                    futuro.set_exception(e)
+
+    def _gravar(self, lote) -> None:
+        with self._escrita:
+            if self._erro is not None:
+                for *_, futuro in lote:
+                    futuro.set_exception(self._erro)
+                return
+            buffer = bytearray()
+            posicoes = []
+            for op, id, payload, futuro in lote:
+                posicoes.append((op, id, self._tamanho + len(buffer) + _CABECALHO.size, payload))
+                buffer += _registro(op, payload)
+            try:
+                _escrever_tudo(self._arquivo.fileno(), buffer)
+                os.fsync(self._arquivo.fileno())  # um fsync para o lote inteiro
+            except OSError as e:
+                # Um write parcial deixaria bytes que deslocam os offsets dos
+                # próximos registros: volta o log ao último tamanho confirmado
+                try:
+                    os.ftruncate(self._arquivo.fileno(), self._tamanho)
+                except OSError:
+                    self._erro = e
+                for *_, futuro in lote:
+                    futuro.set_exception(e)
+                return
+            with self._lock:
+                for op, id, inicio, payload in posicoes:
+                    antigo = self._indice.get(id)
+                    if antigo is not None:
+                        self._vivos -= antigo[1] + _CABECALHO.size
+                    self._aplicar(op, inicio, payload)
+                    if op == _PUT:
+                        self._vivos += len(payload) + _CABECALHO.size
+                self._tamanho += len(buffer)
+                self._desde_checkpoint += len(lote)
+                checkpoint = self._desde_checkpoint >= self.checkpoint_a_cada
+                lixo = 1 - self._vivos / self._tamanho if self._tamanho else 0.0
+        for *_, futuro in lote:
+            futuro.set_result(None)
+        # O lote já está durável: falhas de manutenção só são registradas
+        try:
+            if checkpoint:
+                self.checkpoint()
+            if lixo > self.compactar_acima and self._tamanho > 2**20:
+                self.compactar()
+        except Exception:
+            _log.exception("checkpoint/compactação de %s falhou", self.caminho)
+
+    # API do Repository
+    def add(self, entity: Dict) -> str:
+        id = entity.get("id")
+        id = uuid.uuid4().hex if id is None else str(id)  # id 0 é válido
+        with self._lock:
+            if id in self._ids:
+                raise KeyError(f"id duplicado: {id}")
+            self._ids.add(id)
+        try:
+            payload = json.dumps({**entity, "id": id}).encode()
+            self._enfileirar(_PUT, id, payload).result()  # retorna só após o fsync
+        except BaseException:
+            with self._lock:
+                self._ids.discard(id)
+            raise
+        return id
+
+    def get(self, id: str) -> Optional[Dict]:
+        with self._lock:
+            posicao = self._indice.get(id)
+            if posicao is None:
+                return None
+            payload = os.pread(self._fd, posicao[1], posicao[0])
+        return json.loads(payload)
+
+    def update(self, id: str, entity: Dict) -> bool:
+        with self._lock:
+            if id not in self._ids:
+                return False
+        payload = json.dumps({**entity, "id": id}).encode()
+        self._enfileirar(_PUT, id, payload).result()
+        return True
+
+    def delete(self, id: str) -> bool:
+        with self._lock:
+            if id not in self._ids:
+                return False
+            self._ids.discard(id)
+        try:
+            self._enfileirar(_DELETE, id, id.encode()).result()
+        except BaseException:
+            with self._lock:
+                self._ids.add(id)
+            raise
+        return True
+
+    def __len__(self):
+        with self._lock:
+            return len(self._indice)
+
+    # Checkpoint e compactação
+    def checkpoint(self) -> None:
+        # Serializado: além do .tmp compartilhado, garante que um snapshot
+        # mais antigo nunca sobrescreve um mais novo
+        with self._checkpointando:
+            with self._lock:
+                indice = dict(self._indice)
+                offset = self._tamanho
+                self._desde_checkpoint = 0
+                inode = os.fstat(self._fd).st_ino
+            temporario = self.caminho + ".ckpt.tmp"
+            with open(temporario, "w") as f:
+                json.dump({"inode": inode, "offset": offset, "indice": indice}, f)
+                f.flush()
+                os.fsync(f.fileno())
+            os.replace(temporario, self.caminho + ".ckpt")
+
+    def compactar(self, esperar: bool = False) -> None:
+        """Reescreve o log só com registros vivos, numa thread separada"""
+        with self._lock:
+            if self._compactando is None or not self._compactando.is_alive():
+                self._compactando = threading.Thread(target=self._compactar_seguro, daemon=True)
+                self._compactando.start()
+            thread = self._compactando
+        if esperar and thread is not threading.current_thread():
+            thread.join()
+
+    def _compactar_seguro(self) -> None:
+        try:
+            self._compactar()
+        except Exception:  # o log antigo continua válido; tenta de novo na próxima
+            _log.exception("compactação de %s falhou", self.caminho)
+            if os.path.exists(self.caminho + ".compact"):
+                os.remove(self.caminho + ".compact")
+
+    def _compactar(self) -> None:
+        with self._lock:
+            snapshot = dict(self._indice)
+            fim = self._tamanho
+        novo = self.caminho + ".compact"
+        fd_antigo = os.open(self.caminho, os.O_RDONLY)
+        try:
+            novo_indice: Dict[str, Tuple[int, int]] = {}
+            with open(novo, "wb") as f:
+                offset = 0
+                for id, (inicio, tamanho) in snapshot.items():  # sem locks: leitores seguem
+                    payload = os.pread(fd_antigo, tamanho, inicio)
+                    f.write(_registro(_PUT, payload))
+                    novo_indice[id] = (offset + _CABECALHO.size, tamanho)
+                    offset += _CABECALHO.size + tamanho
+                with self._escrita, self._lock:
+                    # Cauda: registros gravados durante a cópia
+                    cauda = os.pread(fd_antigo, self._tamanho - fim, fim)
+                    for op, inicio, payload in _ler_registros(cauda, offset):
+                        self._aplicar(op, inicio, payload, novo_indice)
+                    f.write(cauda)
+                    f.flush()
+                    os.fsync(f.fileno())
+                    os.replace(novo, self.caminho)
+                    diretorio = os.open(os.path.dirname(os.path.abspath(self.caminho)), os.O_RDONLY)
+                    try:
+                        os.fsync(diretorio)  # o rename também precisa ser durável
+                    finally:
+                        os.close(diretorio)
+                    self._arquivo.close()
+                    os.close(self._fd)
+                    self._arquivo = open(self.caminho, "ab", buffering=0)
+                    self._fd = os.open(self.caminho, os.O_RDONLY)
+                    self._indice = novo_indice
+                    self._tamanho = offset + len(cauda)
+                    self._vivos = sum(n + _CABECALHO.size for _, n in novo_indice.values())
+        finally:
+            os.close(fd_antigo)
+        self.checkpoint()  # o checkpoint antigo aponta para o inode anterior
+
+    def close(self) -> None:
+        with self._cond:
+            self._fechando = True
+            self._cond.notify()
+        self._thread.join()
+        if self._compactando is not None:
+            self._compactando.join()
+        self.checkpoint()
+        self._arquivo.close()
+        os.close(self._fd)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *args):
+        self.close()
+
+
+# Os dois backends implementam Repository, então são intercambiáveis (Strategy):
+# repo: Repository = FileRepository("dados.log") if persistir else InMemoryRepository()
+
+
+# Benchmark: índice vs varredura linear
+def benchmark_repository(n: int = 1_000_000) -> None:
+    repo = InMemoryRepository(hash_indices=["cidade"], sorted_indices=["idade", "salario"])
+    cidades = ["SP", "RJ", "BH", "POA", "REC", "SSA", "CWB", "FOR"]
+    for i in range(n):
+        repo.add({"id": str(i), "cidade": cidades[i % 8], "idade": i % 90,
+                  "salario": (i * 7919) % 1_000_000})
+
+    def varredura(**filtros):
+        return [dict(e) for e in repo._dados.values()
+                if all(f.aceita(e.get(c)) if isinstance(f, Entre) else e.get(c) == f
+                       for c, f in filtros.items())]
+
+    consultas = [
+        {"salario": 424_242},
+        {"salario": Entre(500_000, 500_100), "cidade": "SP"},
+        {"idade": 42, "salario": Entre(0, 20_000)},
+    ]
+    for filtros in consultas:
+        repo.find(**filtros)  # consolida os índices fora da medição
+        inicio = time.perf_counter()
+        rapido = repo.find(**filtros)
+        t_indice = time.perf_counter() - inicio
+        inicio = time.perf_counter()
+        lento = varredura(**filtros)
+        t_scan = time.perf_counter() - inicio
+        assert sorted(e["id"] for e in rapido) == sorted(e["id"] for e in lento)
+        print(f"{filtros}: plano {repo.explicar(**filtros)[0][:2]} | "
+              f"índice {t_indice * 1e3:.3f}ms vs varredura {t_scan * 1e3:.1f}ms")
+
+
+if __name__ == "__main__":
+    benchmark_repository()
@@ -63,6 +63,98 @@ for item in pipeline:
     print(item)
 
 
+# Pipeline paralelo em blocos (mesma saída de numerar(filtrar_vazias(ler_arquivo())))
+# Os generators acima continuam sendo a implementação de referência.
+# Aqui, em vez de três frames de generator por linha:
+# - o arquivo é lido em blocos binários grandes (opcionalmente via mmap),
+#   sempre cortados em fronteiras de linha (b"\n")
+# - cada bloco passa pelas etapas (funções lista -> lista) num Pool de processos
+# - no máximo `em_voo` blocos ficam pendentes (backpressure), e os resultados
+#   são consumidos na ordem de envio, então a numeração é idêntica
+# Obs.: o corte em b"\n" exige encoding compatível com ASCII (utf-8, latin-1).
+import mmap
+import os
+import itertools
+from collections import deque
+from multiprocessing import Pool
+
+
+def limpar_linhas(linhas):
+    """Etapa equivalente a ler_arquivo (strip) + filtrar_vazias"""
+    return [linha for linha in map(str.strip, linhas) if linha]
+
+
+def _blocos(nome, tamanho, usar_mmap):
+    with open(nome, "rb") as f:
+        if usar_mmap:
+            if os.fstat(f.fileno()).st_size == 0:
+                return
+            with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+                inicio = 0
+                while inicio < len(mm):
+                    fim = mm.find(b"\n", min(inicio + tamanho, len(mm)) - 1)
+                    fim = len(mm) if fim == -1 else fim + 1
+                    yield mm[inicio:fim]
+                    inicio = fim
+            return
+        resto = b""
+        while bloco := f.read(tamanho):
+            bloco = resto + bloco
+            corte = bloco.rfind(b"\n") + 1
+            if corte == 0:  # linha maior que o bloco: continua acumulando
+                resto = bloco
+                continue
+            resto = bloco[corte:]
+            yield bloco[:corte]
+        if resto:
+            yield resto
+
+
+def _processar_bloco(bloco, encoding, etapas):
+    texto = bloco.decode(encoding)
+    # mesmas quebras de linha do modo texto (universal newlines)
+    linhas = texto.replace("\r\n", "\n").replace("\r", "\n").split("\n")
+    for etapa in etapas:
+        linhas = etapa(linhas)
+    return linhas
+
+
+def pipeline_paralelo(nome, etapas=(limpar_linhas,), tamanho_bloco=4 * 2**20,
+                      usar_mmap=False, workers=None, em_voo=None, encoding="utf-8"):
+    """Gera lotes (listas) de linhas numeradas, na mesma ordem de numerar()"""
+    workers = workers or os.cpu_count() or 1
+    em_voo = em_voo or 2 * workers
+    numero = 1
+    with Pool(workers) as pool:
+        pendentes = deque()
+        blocos = _blocos(nome, tamanho_bloco, usar_mmap)
+        for bloco in blocos:
+            pendentes.append(pool.apply_async(_processar_bloco, (bloco, encoding, etapas)))
+            if len(pendentes) < em_voo:
+                continue
+            linhas = pendentes.popleft().get()
+            yield [f"{i}: {linha}" for i, linha in enumerate(linhas, numero)]
+            numero += len(linhas)
+        while pendentes:
+            linhas = pendentes.popleft().get()
+            yield [f"{i}: {linha}" for i, linha in enumerate(linhas, numero)]
+            numero += len(linhas)
+
+
+def verificar_equivalencia(nome, **opcoes):
+    """Compara o pipeline paralelo com a implementação de referência"""
+    referencia = numerar(filtrar_vazias(ler_arquivo(nome)))
+    paralelo = itertools.chain.from_iterable(pipeline_paralelo(nome, **opcoes))
+    return all(a == b for a, b in zip(referencia, paralelo, strict=True))
+
+
+# Uso
+# if __name__ == "__main__":
+#     for lote in pipeline_paralelo("dados.txt", usar_mmap=True):
+#         for item in lote:
+#             print(item)
+
+
 # Corrotinas(via send())
 def processador():
     total = 0
@@ -83,6 +175,151 @@ try:
 except StopIteration as e:
     print(f"Total: {e.value}")  # 30
 
+
+# Acumulador em lote
+# processador() custa uma retomada de generator por amostra. Aqui send() aceita
+# tanto um valor quanto um lote (lista, array, array NumPy) e mantém agregados
+# incrementais: soma, contagem, min/max e média/variância (Welford; lotes são
+# combinados pela fórmula paralela de Chan, sem perder estabilidade numérica).
+import asyncio
+import math
+from numbers import Number
+
+
+class Estatisticas:
+    __slots__ = ("contagem", "soma", "minimo", "maximo", "media", "_m2")
+
+    def __init__(self):
+        self.contagem = 0
+        self.soma = 0.0
+        self.minimo = math.inf
+        self.maximo = -math.inf
+        self.media = 0.0
+        self._m2 = 0.0
+
+    @property
+    def variancia(self):
+        """Variância amostral (n - 1)"""
+        return self._m2 / (self.contagem - 1) if self.contagem > 1 else 0.0
+
+    def adicionar(self, valor):
+        self.contagem += 1
+        self.soma += valor
+        self.minimo = min(self.minimo, valor)
+        self.maximo = max(self.maximo, valor)
+        delta = valor - self.media
+        self.media += delta / self.contagem
+        self._m2 += delta * (valor - self.media)
+
+    def adicionar_lote(self, valores):
+        if hasattr(valores, "var"):  # array NumPy: agregados vetorizados
+            n = valores.size
+            if n == 0:
+                return
+            soma, media = float(valores.sum()), float(valores.mean())
+            m2 = float(valores.var()) * n
+            minimo, maximo = float(valores.min()), float(valores.max())
+        else:
+            valores = list(valores)
+            n = len(valores)
+            if n == 0:
+                return
+            soma = math.fsum(valores)
+            media = soma / n
+            m2 = math.fsum((v - media) ** 2 for v in valores)
+            minimo, maximo = min(valores), max(valores)
+
+        total = self.contagem + n
+        delta = media - self.media
+        self.media += delta * n / total
+        self._m2 += m2 + delta * delta * self.contagem * n / total
+        self.contagem = total
+        self.soma += soma
+        self.minimo = min(self.minimo, minimo)
+        self.maximo = max(self.maximo, maximo)
+
+    def send(self, valor):
+        if isinstance(valor, Number):
+            self.adicionar(valor)
+        else:
+            self.adicionar_lote(valor)
+
+    def __repr__(self):
+        return (f"Estatisticas(contagem={self.contagem}, soma={self.soma}, "
+                f"min={self.minimo}, max={self.maximo}, media={self.media:.6g}, "
+                f"variancia={self.variancia:.6g})")
+
+
+def processador_lote():
+    """Mesmo protocolo de processador(), mas aceitando lotes e retornando Estatisticas"""
+    estatisticas = Estatisticas()
+    while True:
+        valor = yield
+        if valor is None:
+            break
+        estatisticas.send(valor)
+    return estatisticas
+
+
+proc = processador_lote()
+next(proc)
+proc.send(10)              # valor único continua funcionando
+proc.send([20, 30, 40])    # lote inteiro numa única retomada
+try:
+    proc.send(None)
+except StopIteration as e:
+    print(e.value)  # contagem=4, soma=100.0, media=25
+
+
+# Interface assíncrona com backpressure
+# A fila é limitada: quando o consumidor atrasa, `await enviar()` suspende o
+# produtor em vez de deixar a memória crescer (como um canal com buffer em Go).
+class AcumuladorAssincrono:
+    def __init__(self, capacidade=64):
+        self.estatisticas = Estatisticas()
+        self.fila = asyncio.Queue(maxsize=capacidade)
+        self._consumidor = None
+        self._erro = None
+
+    async def enviar(self, valor):
+        if self._erro is not None:
+            raise self._erro
+        if self._consumidor is None:
+            self._consumidor = asyncio.create_task(self._consumir())
+        await self.fila.put(valor)
+
+    async def _consumir(self):
+        while (valor := await self.fila.get()) is not None:
+            if self._erro is not None:
+                continue  # já falhou: só drena, para o produtor não travar na fila cheia
+            try:
+                self.estatisticas.send(valor)
+            except Exception as e:  # amostra inválida: reportada em enviar()/fechar()
+                self._erro = e
+
+    async def fechar(self):
+        """Drena a fila e retorna as estatísticas finais"""
+        if self._consumidor is not None:
+            await self.fila.put(None)
+            await self._consumidor
+            self._consumidor = None
+        if self._erro is not None:
+            raise self._erro
+        return self.estatisticas
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *args):
+        await self.fechar()
+
+
+# async def ler_sensor(acumulador):
+#     async with acumulador:
+#         async for lote in abatch(stream_do_sensor(), n=256, max_latencia=0.01):
+#             await acumulador.enviar(lote)
+#     print(acumulador.estatisticas)
+
 # Expressões Geradores( Generator Expressions)
 
 # Similar a list comprehension, mas lazy
@@ -109,6 +346,10 @@ def fibonacci():
         a, b = b, a + b
 
 
+# Para F(n) com n grande ou lotes de índices, veja
+# optmization_and_more/fibonacci.py (fast doubling O(log n) + NumPy)
+
+
 # Maquinas de estado
 #    - Cada "yield" age como um ponto de pausa
 #    - Mais legivel que máquinas de estado manuais
@@ -124,14 +365,23 @@ def chain(*iterables):
 # Equivalente a std::ranges::join_view
 
 # Context managers com generators
+import time
 from contextlib import contextmanager
 
 
 @contextmanager
-def timer(nome):
-    start = time.time()
-    yield  # Código do bloco with executa aqui
-    print(f"{nome} levou {time.time() - start:.2f}s")
+def timer(nome, profiler=None):
+    # Com um Profiler (advanced_topics/context_managers.py) o tempo vira um
+    # span da árvore, sem print; sem ele, perf_counter_ns e um print por uso
+    if profiler is not None:
+        with profiler.span(nome):
+            yield
+        return
+    start = time.perf_counter_ns()
+    try:
+        yield  # Código do bloco with executa aqui
+    finally:
+        print(f"{nome} levou {(time.perf_counter_ns() - start) / 1e6:.3f}ms")
 
 
 # Uso
@@ -156,9 +406,76 @@ async def fetch_data():
 
 
 # Implemente um generator batch que recebe um iterável e um tamanho de batch, produzindo sublistas:
+# - buffers (bytes, bytearray, array, memoryview): fatias de memoryview, sem cópia
+# - sequências e arrays NumPy: fatiamento (no NumPy a fatia é uma view)
+# - iteradores genéricos: islice, sem materializar o iterável
+import asyncio
+from array import array
+from collections.abc import Sequence
+from itertools import islice
+
+
 def batch(iterable, n=1):
-    # Sua implementação aqui
-    ...
+    if n < 1:
+        raise ValueError("n deve ser >= 1")
+    if isinstance(iterable, (bytes, bytearray, memoryview, array)):
+        view = memoryview(iterable)
+        for i in range(0, len(view), n):
+            yield view[i:i + n]
+    elif isinstance(iterable, Sequence) or hasattr(iterable, "__array_interface__"):
+        for i in range(0, len(iterable), n):
+            yield iterable[i:i + n]
+    else:
+        it = iter(iterable)
+        while grupo := list(islice(it, n)):
+            yield grupo
+
+
+async def abatch(aiterable, n=1, max_latencia=None):
+    """Versão assíncrona: fecha o lote com `n` itens ou após `max_latencia` segundos
+    desde o primeiro item do lote (o que vier primeiro)"""
+    if n < 1:
+        raise ValueError("n deve ser >= 1")
+    if max_latencia is None:
+        grupo = []
+        async for item in aiterable:
+            grupo.append(item)
+            if len(grupo) >= n:
+                yield grupo
+                grupo = []
+        if grupo:
+            yield grupo
+        return
+
+    loop = asyncio.get_running_loop()
+    it = aiter(aiterable)
+    grupo, prazo, proximo = [], None, None
+    try:
+        while True:
+            if proximo is None:
+                proximo = asyncio.ensure_future(anext(it))
+            espera = None if prazo is None else max(0.0, prazo - loop.time())
+            feitos, _ = await asyncio.wait({proximo}, timeout=espera)
+            if not feitos:  # latência máxima atingida: entrega o lote parcial
+                yield grupo
+                grupo, prazo = [], None
+                continue
+            tarefa, proximo = proximo, None
+            try:
+                item = tarefa.result()
+            except StopAsyncIteration:
+                break
+            if not grupo:
+                prazo = loop.time() + max_latencia
+            grupo.append(item)
+            if len(grupo) >= n:
+                yield grupo
+                grupo, prazo = [], None
+        if grupo:
+            yield grupo
+    finally:
+        if proximo is not None:
+            proximo.cancel()
 
 
 # Deve funcionar como:
@@ -167,3 +484,11 @@ for group in batch([1, 2, 3, 4, 5, 6, 7, 8], 3):
 # [1, 2, 3]
 # [4, 5, 6]
 # [7, 8]
+
+# Buffers não são copiados:
+# for fatia in batch(bytearray(b"abcdefgh"), 3):
+#     print(bytes(fatia))  # b'abc', b'def', b'gh'
+#
+# Ingestão em streaming (lote fecha com 100 itens ou 50 ms):
+# async for lote in abatch(leituras_do_sensor(), n=100, max_latencia=0.05):
+#     await gravar(lote)
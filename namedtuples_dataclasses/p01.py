@@ -98,3 +98,215 @@ sp.adicionar_vizinhos("Campinas")
 
 
 
+
+
+# Índice espacial (KD-tree) para Ponto / Coordenada
+# Sem índice, achar vizinhos custa O(N²) chamadas a Ponto.distancia.
+# A KD-tree divide o plano alternando os eixos x/y pela mediana,
+# respondendo consultas em ~O(log N) (similar a um std::nth_element recursivo).
+# Layout implícito: nenhum objeto "nó"; o intervalo [lo, hi) tem a raiz em
+# (lo + hi) // 2, a subárvore esquerda antes e a direita depois.
+# Para Coordenada(lat, long) a distância é plana (em graus): boa para regiões
+# pequenas; para distâncias geodésicas, projete as coordenadas antes.
+import heapq
+
+
+class IndiceEspacial:
+    def __init__(self, xs, ys, itens=None):
+        if len(xs) != len(ys):
+            raise ValueError("xs e ys devem ter o mesmo tamanho")
+        itens = list(range(len(xs))) if itens is None else list(itens)
+        registros = list(zip(xs, ys, itens))
+        self._construir(registros, 0, len(registros), 0)
+        self._xs = [r[0] for r in registros]
+        self._ys = [r[1] for r in registros]
+        self._itens = [r[2] for r in registros]
+
+    @classmethod
+    def de_pontos(cls, pontos):
+        """Constroi a partir de Ponto (.x/.y), Coordenada (.lat/.long) ou pares (x, y)"""
+        pontos = list(pontos)
+        pares = [(p.x, p.y) if hasattr(p, "x")
+                 else (p.lat, p.long) if hasattr(p, "lat")
+                 else (p[0], p[1]) for p in pontos]
+        return cls([x for x, _ in pares], [y for _, y in pares], pontos)
+
+    def __len__(self):
+        return len(self._itens)
+
+    @classmethod
+    def _construir(cls, registros, lo, hi, eixo):
+        # Iterativo com pilha: sem risco de estourar a recursão
+        pilha = [(lo, hi, eixo)]
+        while pilha:
+            lo, hi, eixo = pilha.pop()
+            if hi - lo <= 1:
+                continue
+            registros[lo:hi] = sorted(registros[lo:hi], key=lambda r: r[eixo])
+            meio = (lo + hi) // 2
+            pilha.append((lo, meio, 1 - eixo))
+            pilha.append((meio + 1, hi, 1 - eixo))
+
+    def k_proximos(self, x, y, k=1):
+        """Lista [(distancia, item)] dos k itens mais próximos, do mais perto ao mais longe"""
+        xs, ys = self._xs, self._ys
+        heap = []  # max-heap via distância negativa: (-d², posição)
+        pilha = [(0, len(xs), 0)]
+        while pilha:
+            lo, hi, eixo = pilha.pop()
+            if lo >= hi:
+                continue
+            meio = (lo + hi) // 2
+            d2 = (xs[meio] - x) ** 2 + (ys[meio] - y) ** 2
+            if len(heap) < k:
+                heapq.heappush(heap, (-d2, meio))
+            elif d2 < -heap[0][0]:
+                heapq.heapreplace(heap, (-d2, meio))
+            delta = (x if eixo == 0 else y) - (xs[meio] if eixo == 0 else ys[meio])
+            perto, longe = ((lo, meio), (meio + 1, hi)) if delta < 0 else ((meio + 1, hi), (lo, meio))
+            # Só visita o lado distante se o plano de corte estiver dentro do raio atual
+            if len(heap) < k or delta * delta < -heap[0][0]:
+                pilha.append((*longe, 1 - eixo))
+            pilha.append((*perto, 1 - eixo))
+        return [(d ** 0.5, self._itens[i]) for d, i in sorted((-d, i) for d, i in heap)]
+
+    def no_raio(self, x, y, raio):
+        """Itens a distância <= raio de (x, y)"""
+        return self._varrer(x - raio, y - raio, x + raio, y + raio,
+                            lambda px, py: (px - x) ** 2 + (py - y) ** 2 <= raio * raio)
+
+    def no_retangulo(self, xmin, ymin, xmax, ymax):
+        """Itens dentro da caixa [xmin, xmax] × [ymin, ymax]"""
+        return self._varrer(xmin, ymin, xmax, ymax, lambda px, py: True)
+
+    def _varrer(self, xmin, ymin, xmax, ymax, aceita):
+        xs, ys = self._xs, self._ys
+        minimos, maximos = (xmin, ymin), (xmax, ymax)
+        resultado = []
+        pilha = [(0, len(xs), 0)]
+        while pilha:
+            lo, hi, eixo = pilha.pop()
+            if lo >= hi:
+                continue
+            meio = (lo + hi) // 2
+            px, py = xs[meio], ys[meio]
+            if xmin <= px <= xmax and ymin <= py <= ymax and aceita(px, py):
+                resultado.append(self._itens[meio])
+            corte = px if eixo == 0 else py
+            if minimos[eixo] <= corte:
+                pilha.append((lo, meio, 1 - eixo))
+            if maximos[eixo] >= corte:
+                pilha.append((meio + 1, hi, 1 - eixo))
+        return resultado
+
+
+def preencher_vizinhos(cidades, k=None, raio=None):
+    """Preenche Cidade.vizinhos para todo o dataset com uma única construção de índice"""
+    if (k is None) == (raio is None):
+        raise ValueError("informe exatamente um entre k e raio")
+    cidades = list(cidades)
+    indice = IndiceEspacial([c.coordenadas.lat for c in cidades],
+                            [c.coordenadas.long for c in cidades], cidades)
+    for cidade in cidades:
+        lat, long = cidade.coordenadas
+        if k is not None:
+            proximas = [c for _, c in indice.k_proximos(lat, long, k + 1)]
+        else:
+            proximas = indice.no_raio(lat, long, raio)
+        cidade.vizinhos = [c.nome for c in proximas if c is not cidade][:k]
+
+
+# Uso
+# cidades = [sp, Cidade("Campinas", Coordenada(-22.9, -47.1)), ...]
+# preencher_vizinhos(cidades, k=3)          # 3 mais próximas de cada cidade
+# preencher_vizinhos(cidades, raio=1.0)     # todas a até 1 grau
+# indice = IndiceEspacial.de_pontos(pontos)
+# indice.k_proximos(0, 0, k=5)
+
+
+# Struct-of-arrays: PontoArray
+# Cada Ponto (namedtuple/dataclass) custa ~60-100 bytes + cabeçalho de objeto.
+# Com dezenas de milhões de pontos, guardar colunas contíguas é muito mais barato:
+# - x, y: arrays float64 (16 bytes por ponto)
+# - nome: codificação por dicionário (códigos int32 + lista de nomes distintos)
+# Equivalente em C++: struct { std::vector<double> x, y; std::vector<int> nome; }
+import numpy as np
+
+
+class PontoArray:
+    __slots__ = ("x", "y", "_codigos", "_nomes")
+
+    def __init__(self, x, y, nome="origem"):
+        self.x = np.asarray(x, dtype=np.float64)
+        self.y = np.asarray(y, dtype=np.float64)
+        if self.x.shape != self.y.shape or self.x.ndim != 1:
+            raise ValueError("x e y devem ser vetores do mesmo tamanho")
+        if isinstance(nome, str):
+            self._nomes = [nome]
+            self._codigos = np.zeros(len(self.x), dtype=np.int32)
+        else:
+            nomes, codigos = np.unique(np.asarray(nome, dtype=object), return_inverse=True)
+            if len(codigos) != len(self.x):
+                raise ValueError("nome deve ter um valor por ponto")
+            self._nomes = list(nomes)
+            self._codigos = codigos.astype(np.int32)
+
+    @classmethod
+    def de_pontos(cls, pontos):
+        pontos = list(pontos)
+        return cls([p.x for p in pontos], [p.y for p in pontos],
+                   [getattr(p, "nome", "origem") for p in pontos])
+
+    def __len__(self):
+        return len(self.x)
+
+    def __getitem__(self, i):
+        if isinstance(i, slice):  # fatia: views das colunas, sem cópia
+            fatia = object.__new__(PontoArray)
+            fatia.x, fatia.y, fatia._codigos = self.x[i], self.y[i], self._codigos[i]
+            fatia._nomes = self._nomes
+            return fatia
+        # Ponto materializado só quando pedido
+        return Ponto(float(self.x[i]), float(self.y[i]), self._nomes[self._codigos[i]])
+
+    @property
+    def nome(self):
+        return np.asarray(self._nomes, dtype=object)[self._codigos]
+
+    def distancia(self, outro):
+        """Distâncias vetorizadas até um Ponto ou, elemento a elemento, até outro PontoArray"""
+        return np.hypot(self.x - outro.x, self.y - outro.y)
+
+    def nbytes(self):
+        return self.x.nbytes + self.y.nbytes + self._codigos.nbytes
+
+
+# Benchmark: memória e throughput vs lista de Ponto
+import time
+import tracemalloc
+
+
+def benchmark_ponto_array(n=1_000_000):
+    tracemalloc.start()
+    pontos = [Ponto(float(i), float(-i)) for i in range(n)]
+    mem_lista = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+
+    array = PontoArray.de_pontos(pontos)
+    origem = Ponto(0.0, 0.0)
+
+    start = time.perf_counter()
+    lista = [((p.x - origem.x) ** 2 + (p.y - origem.y) ** 2) ** 0.5 for p in pontos]
+    t_lista = time.perf_counter() - start
+
+    start = time.perf_counter()
+    vetor = array.distancia(origem)
+    t_array = time.perf_counter() - start
+
+    assert np.allclose(lista, vetor)
+    print(f"list[Ponto]: {mem_lista / 2**20:.1f} MiB, {t_lista:.3f}s")
+    print(f"PontoArray:  {array.nbytes() / 2**20:.1f} MiB, {t_array:.4f}s")
+
+
+if __name__ == "__main__":
+    benchmark_ponto_array()
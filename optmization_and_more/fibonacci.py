@@ -0,0 +1,130 @@
+# Fibonacci: uma implementação para todos os casos
+# O repositório tem várias versões (generators_yield/p01.py, list_comprehensions/p04.py,
+# a recursiva de advanced_decorators.py e a Cython de libs_python/dicas.py).
+# Todas são O(n) ou exponenciais. Aqui:
+# - fib(n) grande: fast doubling, O(log n) multiplicações
+# - fib(n) pequeno e repetido: tabela de prefixos em cache, O(1)
+# - fib_vetorizado(indices): NumPy para lotes de índices, com fallback
+#   para inteiros Python (dtype=object) quando o resultado não cabe em int64
+
+import threading
+import time
+
+import numpy as np
+
+# Fast doubling
+# F(2k)   = F(k) * (2*F(k+1) - F(k))
+# F(2k+1) = F(k)^2 + F(k+1)^2
+# Percorre os bits de n do mais significativo ao menos (sem recursão).
+
+
+def fib_doubling(n: int) -> int:
+    if n < 0:
+        raise ValueError("n deve ser >= 0")
+    a, b = 0, 1  # F(k), F(k+1) com k = 0
+    for bit in bin(n)[2:]:
+        c = a * (2 * b - a)  # F(2k)
+        d = a * a + b * b    # F(2k+1)
+        a, b = (d, c + d) if bit == "1" else (c, d)
+    return a
+
+
+# Tabela de prefixos
+# Cresce sob demanda até LIMITE_TABELA; acima disso, fast doubling.
+# Leituras sem lock; o crescimento é calculado numa lista local e anexado de
+# uma vez (extend), sob lock, para duas threads não intercalarem appends.
+LIMITE_TABELA = 10_000
+_tabela = [0, 1]
+_tabela_lock = threading.Lock()
+
+
+def fib(n: int) -> int:
+    if n < 0:
+        raise ValueError("n deve ser >= 0")
+    if n < len(_tabela):
+        return _tabela[n]
+    if n > LIMITE_TABELA:
+        return fib_doubling(n)
+    with _tabela_lock:
+        if n >= len(_tabela):  # outra thread pode ter crescido a tabela antes
+            a, b = _tabela[-2], _tabela[-1]
+            novos = []
+            for _ in range(len(_tabela), n + 1):
+                a, b = b, a + b
+                novos.append(b)
+            _tabela.extend(novos)
+    return _tabela[n]
+
+
+# Caminho vetorizado
+# F(92) é o maior Fibonacci que cabe em int64.
+MAX_INT64 = 92
+_TABELA_INT64 = np.array([fib(i) for i in range(MAX_INT64 + 1)], dtype=np.int64)
+
+
+def fib_vetorizado(indices) -> np.ndarray:
+    """F(i) para cada índice; int64 quando possível, senão dtype=object sem overflow"""
+    indices = np.asarray(indices, dtype=np.int64)
+    if indices.size and indices.min() < 0:
+        raise ValueError("índices devem ser >= 0")
+    if indices.size == 0 or indices.max() <= MAX_INT64:
+        return _TABELA_INT64[indices]  # um único gather, sem laço Python
+    # Fallback: calcula cada índice distinto uma vez (inteiros Python)
+    unicos, inversos = np.unique(indices, return_inverse=True)
+    valores = np.array([fib(int(i)) for i in unicos], dtype=object)
+    return valores[inversos].reshape(indices.shape)
+
+
+# Versões existentes, para comparação
+def fibonacci_gen():
+    a, b = 0, 1
+    while True:
+        yield a
+        a, b = b, a + b
+
+
+def fibonacci_recursivo(n):
+    if n <= 1:
+        return n
+    return fibonacci_recursivo(n - 1) + fibonacci_recursivo(n - 2)
+
+
+def _cronometrar(func, *args, repeticoes=1):
+    start = time.perf_counter()
+    for _ in range(repeticoes):
+        resultado = func(*args)
+    return resultado, (time.perf_counter() - start) / repeticoes
+
+
+def benchmark():
+    def nth_gen(n):
+        gen = fibonacci_gen()
+        for _ in range(n):
+            next(gen)
+        return next(gen)
+
+    # Índice único grande
+    for n in (1_000, 10_000, 100_000):
+        ref, t_gen = _cronometrar(nth_gen, n)
+        res, t_dbl = _cronometrar(fib_doubling, n)
+        assert res == ref
+        print(f"F({n}): generator {t_gen:.4f}s | doubling {t_dbl:.6f}s")
+
+    # Recursiva exponencial
+    ref, t_rec = _cronometrar(fibonacci_recursivo, 25)
+    res, t_fib = _cronometrar(fib, 25, repeticoes=1000)
+    assert res == ref
+    print(f"F(25): recursiva {t_rec:.4f}s | tabela {t_fib * 1e6:.2f}µs")
+
+    # Muitas consultas pequenas
+    indices = np.random.default_rng(0).integers(0, MAX_INT64 + 1, 1_000_000)
+    ref, t_gen = _cronometrar(lambda: [nth_gen(int(i)) for i in indices[:10_000]])
+    res, t_vet = _cronometrar(fib_vetorizado, indices)
+    assert res[:10_000].tolist() == ref
+    print(f"10k índices via generator: {t_gen:.4f}s | "
+          f"1M índices vetorizado: {t_vet:.4f}s")
+
+
+if __name__ == "__main__":
+    print(fib(10), fib_doubling(100), fib_vetorizado([0, 1, 2, 3, 100]))
+    benchmark()
@@ -8,15 +8,243 @@ def funcao_lenta():
     # Código a ser analisado
     ...
 
-cProfile.run('funcao_lenta()')
+# Objeto em vez de string: sem eval e com acesso direto às estatísticas
+with cProfile.Profile() as perfil_rapido:
+    funcao_lenta()
+perfil_rapido.print_stats("cumulative")
 
 
 # b. line_profiler (para detalhamento por linha):
+# `profile` só existe quando o script roda via `kernprof -l`
+try:
+    profile
+except NameError:
+    def profile(func):
+        return func
+
+
 @profile
 def funcao_alvo():
     # Código a ser analisado
     ...
 
+
+# c. Profiling amostrado em produção (@profiled)
+# - taxa: fração das chamadas perfiladas; fora da amostra o custo é um random()
+# - um cProfile.Profile por thread acumula entre chamadas (sem reiniciar); cada
+#   thread liga e desliga o seu (enable/disable só valem para a thread que os
+#   chama) só enquanto tem uma chamada amostrada ativa; o dump junta todos
+# - uma thread amostra as pilhas (sys._current_frames) das threads perfiladas
+#   a cada `intervalo` segundos: hot-spots por linha e flamegraph
+# - dump sob demanda (salvar) ou por sinal (instalar_sinal, ex.: SIGUSR1)
+# Obs.: as amostras de pilha cobrem todas as threads com chamadas perfiladas
+# em andamento.
+import json
+import pstats
+import random
+import signal
+import sys
+import threading
+import time
+from collections import Counter
+from contextlib import contextmanager
+from functools import wraps
+
+
+class _Instantaneo:
+    """Stats já coletados; pstats.Stats(perfil) chamaria create_stats(), que desliga o perfil"""
+
+    def __init__(self, stats):
+        self.stats = stats
+
+    def create_stats(self):
+        pass
+
+
+class SamplingProfiler:
+    def __init__(self, intervalo: float = 0.005, profundidade: int = 128):
+        self.intervalo = intervalo
+        self.profundidade = profundidade
+        self._perfis = {}  # thread id -> cProfile.Profile daquela thread
+        self._local = threading.local()
+        self._lock = threading.RLock()  # reentrante: o handler de sinal chama stats()
+        self._ativos = Counter()  # thread id -> chamadas amostradas em andamento
+        self._tem_ativos = threading.Event()
+        self._thread = None
+        self.linhas = Counter()   # (arquivo, linha, função) -> amostras
+        self.pilhas = Counter()   # ((arquivo, linha, função), ...) raiz -> folha
+        self.funcoes = {}         # nome -> [chamadas, amostradas, ns amostrados]
+
+    def _entrar(self):
+        tid = threading.get_ident()
+        with self._lock:
+            if tid not in self._perfis:
+                self._perfis[tid] = cProfile.Profile()
+            perfil = self._perfis[tid]
+            self._ativos[tid] += 1
+            primeiro = self._ativos[tid] == 1
+            self._tem_ativos.set()
+            if self._thread is None:
+                self._thread = threading.Thread(target=self._amostrar, daemon=True)
+                self._thread.start()
+        if primeiro:
+            try:
+                perfil.enable()  # na própria thread: é ela que vai desligar
+                self._local.ligado = True
+            except ValueError:  # 3.12+: outro profiler já ativo; fica só a amostragem
+                self._local.ligado = False
+
+    def _sair(self):
+        tid = threading.get_ident()
+        with self._lock:
+            self._ativos[tid] -= 1
+            ultimo = not self._ativos[tid]
+            if ultimo:
+                del self._ativos[tid]
+            if not self._ativos:
+                self._tem_ativos.clear()
+        if ultimo and self._local.ligado:
+            self._perfis[tid].disable()
+
+    def _amostrar(self):
+        while True:
+            self._tem_ativos.wait()
+            time.sleep(self.intervalo)
+            with self._lock:
+                tids = list(self._ativos)
+            frames = sys._current_frames()
+            pilhas = []
+            for tid in tids:
+                frame = frames.get(tid)
+                pilha = []
+                while frame is not None and len(pilha) < self.profundidade:
+                    codigo = frame.f_code
+                    pilha.append((codigo.co_filename, frame.f_lineno, codigo.co_name))
+                    frame = frame.f_back
+                if pilha:
+                    pilhas.append(pilha)
+            with self._lock:  # dumps iteram esses Counters em outras threads
+                for pilha in pilhas:
+                    self.linhas[pilha[0]] += 1
+                    self.pilhas[tuple(reversed(pilha))] += 1
+
+    def profiled(self, func=None, *, taxa: float = 1.0, nome: str = None):
+        """Decorator: perfila uma fração `taxa` das chamadas de `func`"""
+        if func is None:
+            return lambda f: self.profiled(f, taxa=taxa, nome=nome)
+        rotulo = nome or func.__qualname__
+        estatisticas = self.funcoes.setdefault(rotulo, [0, 0, 0])
+
+        @wraps(func)
+        def wrapper(*args, **kwargs):
+            estatisticas[0] += 1
+            if taxa <= 0 or random.random() >= taxa:
+                return func(*args, **kwargs)
+            estatisticas[1] += 1
+            inicio = time.perf_counter_ns()
+            self._entrar()
+            try:
+                return func(*args, **kwargs)
+            finally:
+                self._sair()
+                estatisticas[2] += time.perf_counter_ns() - inicio
+
+        return wrapper
+
+    @contextmanager
+    def perfilando(self, nome: str = "bloco", taxa: float = 1.0):
+        """Context manager equivalente ao decorator"""
+        estatisticas = self.funcoes.setdefault(nome, [0, 0, 0])
+        estatisticas[0] += 1
+        if taxa <= 0 or random.random() >= taxa:
+            yield
+            return
+        estatisticas[1] += 1
+        inicio = time.perf_counter_ns()
+        self._entrar()
+        try:
+            yield
+        finally:
+            self._sair()
+            estatisticas[2] += time.perf_counter_ns() - inicio
+
+    def stats(self) -> pstats.Stats:
+        with self._lock:
+            perfis = list(self._perfis.values())
+        estatisticas = pstats.Stats()
+        for perfil in perfis:
+            perfil.snapshot_stats()  # copia os contadores sem desligar o profiler
+            estatisticas.add(_Instantaneo(perfil.stats))
+        return estatisticas
+
+    def hot_spots(self, n: int = 10):
+        """Linhas onde as amostras mais caíram: [(arquivo, linha, função, %)]"""
+        with self._lock:
+            linhas = self.linhas.copy()
+        total = sum(linhas.values()) or 1
+        return [(*local, 100 * qtd / total) for local, qtd in linhas.most_common(n)]
+
+    def salvar_pstats(self, caminho: str) -> None:
+        self.stats().dump_stats(caminho)  # abre com snakeviz ou pstats.Stats
+
+    def salvar_speedscope(self, caminho: str) -> None:
+        with self._lock:
+            pilhas = self.pilhas.copy()
+        frames, indices, samples, weights = [], {}, [], []
+        for pilha, qtd in pilhas.items():
+            amostra = []
+            for arquivo, linha, funcao in pilha:
+                chave = (arquivo, linha, funcao)
+                if chave not in indices:
+                    indices[chave] = len(frames)
+                    frames.append({"name": funcao, "file": arquivo, "line": linha})
+                amostra.append(indices[chave])
+            samples.append(amostra)
+            weights.append(qtd * self.intervalo)
+        documento = {
+            "$schema": "https://www.speedscope.app/file-format-schema.json",
+            "shared": {"frames": frames},
+            "profiles": [{
+                "type": "sampled", "name": "profiled", "unit": "seconds",
+                "startValue": 0, "endValue": sum(weights),
+                "samples": samples, "weights": weights,
+            }],
+        }
+        with open(caminho, "w") as f:
+            json.dump(documento, f)
+
+    def salvar(self, prefixo: str = "perfil") -> None:
+        self.salvar_pstats(f"{prefixo}.pstats")
+        self.salvar_speedscope(f"{prefixo}.speedscope.json")
+
+    def instalar_sinal(self, sinal=getattr(signal, "SIGUSR1", None), prefixo: str = "perfil"):
+        """Ex.: kill -USR1 <pid> grava os arquivos sem parar o processo"""
+        signal.signal(sinal, lambda *_: self.salvar(prefixo))
+
+    def imprimir(self, n: int = 10) -> None:
+        with self._lock:
+            funcoes = {rotulo: list(valores) for rotulo, valores in self.funcoes.items()}
+        for rotulo, (chamadas, amostradas, ns) in funcoes.items():
+            media = ns / amostradas / 1e3 if amostradas else 0.0
+            print(f"{rotulo}: {chamadas} chamadas, {amostradas} perfiladas, {media:.1f}µs/chamada")
+        for arquivo, linha, funcao, pct in self.hot_spots(n):
+            print(f"{pct:5.1f}%  {arquivo}:{linha} ({funcao})")
+
+
+sampler = SamplingProfiler()
+profiled = sampler.profiled
+
+
+@profiled(taxa=0.01)  # 1% das chamadas em produção
+def funcao_monitorada(n):
+    return sum(i * i for i in range(n))
+
+
+# for _ in range(10_000):
+#     funcao_monitorada(1000)
+# sampler.imprimir()
+# sampler.salvar("producao")  # producao.pstats + producao.speedscope.json
+
 # 2. Otimizações Comprovadas
 # a. Use estruturas de dados adequadas:
 # Busca rápida
@@ -50,23 +278,156 @@ from setuptools import setup
 setup(ext_modules=cythonize("modulo_rapido.pyx"))
 
 # 4. Multiprocessing para CPU-bound
-from multiprocessing import Pool
+import os
+from multiprocessing import Pool, shared_memory
+
+import numpy as np
+
+# Redução paralela reutilizável
+# - Os dados vão para memória compartilhada uma única vez (sem lista de fatias)
+# - Os workers recebem só (início, fim) e calculam com NumPy sobre uma view
+# - Os intervalos são gerados de forma lazy e consumidos com imap_unordered
+# - O Pool é persistente: criado uma vez, reaproveitado entre chamadas
+
+_INT64_MAX = 2**63 - 1
+
+
+def _soma_exata(a: np.ndarray, quadrados: bool):
+    """Soma (dos quadrados) sem overflow silencioso de int64
+
+    Floats vão direto para o NumPy. Inteiros são somados em sub-blocos pequenos
+    o bastante para que nenhum parcial passe de int64 (limite calculado pelo
+    maior |x|), e os parciais são acumulados como int do Python: resultado
+    exato, como o sum(x*x for x in chunk) original.
+    """
+    if a.dtype.kind not in "iub":
+        return np.dot(a, a) if quadrados else np.sum(a)
+    if a.size == 0:
+        return 0
+    maximo = max(abs(int(a.min())), abs(int(a.max())))
+    if maximo == 0:
+        return 0
+    por_bloco = _INT64_MAX // (maximo * maximo if quadrados else maximo)
+    if por_bloco == 0:  # nem um único quadrado cabe em int64
+        return sum(x * x for x in a.tolist())
+    total = 0
+    for inicio in range(0, a.size, por_bloco):
+        bloco = a[inicio:inicio + por_bloco].astype(np.int64, copy=False)
+        total += int(np.dot(bloco, bloco) if quadrados else bloco.sum())
+    return total
+
 
+def _python(valor):
+    return valor.item() if isinstance(valor, np.generic) else valor
 
-def process_chunk(chunk):
-    return sum(x*x for x in chunk)
 
-def parallel_sum(numbers, chunksize=1000):
-    with Pool() as pool:
-        chunks = [numbers[i:i+chunksize] 
-                 for i in range(0, len(numbers), chunksize)]
-        return sum(pool.map(process_chunk, chunks))
+# operação -> (redução local no worker, combinação dos resultados parciais)
+_REDUCOES = {
+    "sum": (lambda a: _soma_exata(a, False), sum),
+    "sum_squares": (lambda a: _soma_exata(a, True), sum),
+    "min": (np.min, min),
+    "max": (np.max, max),
+}
+
+_anexado = {}  # cache por worker: nome -> SharedMemory
+
+
+def _view_compartilhada(nome: str, n: int, dtype: str) -> np.ndarray:
+    if nome not in _anexado:
+        for antigo in _anexado.values():  # buffer de uma chamada anterior
+            antigo.close()
+        _anexado.clear()
+        _anexado[nome] = shared_memory.SharedMemory(name=nome)
+    return np.ndarray((n,), dtype=dtype, buffer=_anexado[nome].buf)
+
+
+def _reduce_range(tarefa):
+    nome, n, dtype, op, start, stop = tarefa
+    dados = _view_compartilhada(nome, n, dtype)
+    return _REDUCOES[op][0](dados[start:stop])
+
+
+def escolher_chunksize(n: int, workers: int, minimo: int = 16_384) -> int:
+    """~4 blocos por worker: balanceia a carga sem custo de despacho excessivo"""
+    return max(minimo, -(-n // (workers * 4)))
+
+
+def _intervalos(n: int, chunksize: int):
+    for start in range(0, n, chunksize):
+        yield start, min(start + chunksize, n)
+
+
+class ParallelReducer:
+    def __init__(self, processes: int = None):
+        self.processes = processes or os.cpu_count() or 1
+        self._pool = None
+
+    @property
+    def pool(self) -> Pool:
+        if self._pool is None:  # criado sob demanda e reaproveitado
+            self._pool = Pool(self.processes)
+        return self._pool
+
+    def reduce(self, numbers, op: str = "sum_squares", chunksize: int = None):
+        """Aplica a redução `op` em paralelo sobre `numbers`"""
+        if op not in _REDUCOES:
+            raise ValueError(f"operação desconhecida: {op!r}")
+        local, combinar = _REDUCOES[op]
+        dados = np.ascontiguousarray(numbers)
+        if dados.size == 0 and not isinstance(numbers, np.ndarray):
+            dados = dados.astype(np.int64)  # [] -> 0, como sum() do Python
+        n = len(dados)
+        chunksize = chunksize or escolher_chunksize(n, self.processes)
+        # pequeno demais para compensar o IPC, ou ints além de int64 (dtype=object,
+        # que não pode ir para memória compartilhada)
+        if n <= chunksize or dados.dtype.kind == "O":
+            return _python(local(dados))
+
+        bloco = shared_memory.SharedMemory(create=True, size=dados.nbytes)
+        try:
+            compartilhado = np.ndarray(dados.shape, dtype=dados.dtype, buffer=bloco.buf)
+            compartilhado[:] = dados
+            del compartilhado
+            tarefas = ((bloco.name, n, dados.dtype.str, op, start, stop)
+                       for start, stop in _intervalos(n, chunksize))
+            return combinar(_python(parcial)
+                            for parcial in self.pool.imap_unordered(_reduce_range, tarefas))
+        finally:
+            bloco.close()
+            bloco.unlink()
+
+    def close(self) -> None:
+        if self._pool is not None:
+            self._pool.close()
+            self._pool.join()
+            self._pool = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *args):
+        self.close()
+
+
+def parallel_sum(numbers, chunksize=None, reducer: ParallelReducer = None):
+    """Soma dos quadrados; passe `reducer` para reaproveitar o Pool entre chamadas"""
+    if reducer is not None:
+        return reducer.reduce(numbers, "sum_squares", chunksize)
+    with ParallelReducer() as reducer:
+        return reducer.reduce(numbers, "sum_squares", chunksize)
+
+
+# Uso
+# with ParallelReducer() as reducer:
+#     total = parallel_sum(np.arange(10_000_000, dtype=np.float64), reducer=reducer)
+#     maior = reducer.reduce(dados, "max")
 
 # Caso Real: Sistema de Processamento de Dados
 
-from concurrent.futures import ThreadPoolExecutor
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
 # Versão Pythonica + Otimizada
 from dataclasses import dataclass
+from multiprocessing import shared_memory
 from typing import Iterable, List
 
 import numpy as np
@@ -77,6 +438,88 @@ class DataPoint:
     timestamp: float
     values: List[float]
 
+
+# Container colunar (struct-of-arrays)
+# - Um único array float64 contíguo para os timestamps
+# - Uma matriz 2-D (n, n_values) para os valores
+# - Cresce por blocos (append_chunk), como um std::vector com reserve()
+# - Nenhum objeto Python por ponto: a análise opera direto nas colunas
+class DataPointBatch:
+    def __init__(self, n_values: int, capacity: int = 1024):
+        self.n_values = n_values
+        self._timestamps = np.empty(capacity, dtype=np.float64)
+        self._values = np.empty((capacity, n_values), dtype=np.float64)
+        self._size = 0
+
+    def __len__(self) -> int:
+        return self._size
+
+    def __getitem__(self, i: int) -> DataPoint:
+        """Materializa um DataPoint apenas quando pedido"""
+        if not -self._size <= i < self._size:
+            raise IndexError("índice fora do batch")
+        i %= self._size
+        return DataPoint(float(self._timestamps[i]), self._values[i].tolist())
+
+    @property
+    def timestamps(self) -> np.ndarray:
+        return self._timestamps[:self._size]  # view, sem cópia
+
+    @property
+    def values(self) -> np.ndarray:
+        return self._values[:self._size]  # view, sem cópia
+
+    def _reserve(self, extra: int) -> None:
+        needed = self._size + extra
+        capacity = len(self._timestamps)
+        if needed <= capacity:
+            return
+        capacity = max(needed, 2 * capacity)  # crescimento geométrico
+        timestamps = np.empty(capacity, dtype=np.float64)
+        values = np.empty((capacity, self.n_values), dtype=np.float64)
+        timestamps[:self._size] = self.timestamps
+        values[:self._size] = self.values
+        self._timestamps, self._values = timestamps, values
+
+    def append_chunk(self, timestamps, values) -> None:
+        """Adiciona um bloco inteiro de pontos de uma vez"""
+        timestamps = np.asarray(timestamps, dtype=np.float64).ravel()
+        n = len(timestamps)
+        values = np.asarray(values, dtype=np.float64).reshape(n, self.n_values)
+        self._reserve(n)
+        self._timestamps[self._size:self._size + n] = timestamps
+        self._values[self._size:self._size + n] = values
+        self._size += n
+
+    def append(self, timestamp: float, values: List[float]) -> None:
+        self.append_chunk([timestamp], [values])
+
+    @classmethod
+    def from_points(cls, points: List[DataPoint]) -> "DataPointBatch":
+        """Converte o formato antigo (lista de dataclasses) uma única vez"""
+        n_values = len(points[0].values) if points else 0
+        batch = cls(n_values, capacity=max(len(points), 1))
+        batch.append_chunk([p.timestamp for p in points], [p.values for p in points])
+        return batch
+
+
+# Worker do backend "process"
+# Recebe apenas os nomes dos blocos de memória compartilhada e um intervalo
+# de índices: nenhum DataPoint é serializado (pickle) entre processos.
+def _process_range(nomes, n: int, n_values: int, start: int, stop: int) -> None:
+    blocos = [shared_memory.SharedMemory(name=nome) for nome in nomes]
+    try:
+        timestamps = np.ndarray((n,), dtype=np.float64, buffer=blocos[0].buf)
+        values = np.ndarray((n, n_values), dtype=np.float64, buffer=blocos[1].buf)
+        out = np.ndarray((n,), dtype=np.float64, buffer=blocos[2].buf)
+        out[start:stop] = (values[start:stop].mean(axis=1)
+                           * np.log(timestamps[start:stop]))
+        del timestamps, values, out  # views precisam sumir antes do close()
+    finally:
+        for bloco in blocos:
+            bloco.close()
+
+
 class DataProcessor:
     def __init__(self, max_workers: int = 4):
         self.max_workers = max_workers
@@ -84,19 +527,101 @@ class DataProcessor:
     def _process_single(self, point: DataPoint) -> float:
         """Processa um único ponto de dados"""
         return np.mean(point.values) * np.log(point.timestamp)
+
+    def _process_shared(self, batch: DataPointBatch) -> np.ndarray:
+        """Divide o batch em intervalos e processa em vários núcleos"""
+        n, n_values = len(batch), batch.n_values
+        if n == 0:
+            return np.empty(0, dtype=np.float64)
+        tamanhos = (n * 8, n * n_values * 8 or 1, n * 8)
+        blocos = [shared_memory.SharedMemory(create=True, size=t) for t in tamanhos]
+        try:
+            timestamps = np.ndarray((n,), dtype=np.float64, buffer=blocos[0].buf)
+            values = np.ndarray((n, n_values), dtype=np.float64, buffer=blocos[1].buf)
+            out = np.ndarray((n,), dtype=np.float64, buffer=blocos[2].buf)
+            timestamps[:] = batch.timestamps
+            values[:] = batch.values
+
+            nomes = [bloco.name for bloco in blocos]
+            step = -(-n // self.max_workers)  # divisão com teto
+            with ProcessPoolExecutor(max_workers=self.max_workers) as executor:
+                futures = [
+                    executor.submit(_process_range, nomes, n, n_values,
+                                    start, min(start + step, n))
+                    for start in range(0, n, step)
+                ]
+                for future in futures:
+                    future.result()  # propaga exceções dos workers
+
+            result = out.copy()
+            del timestamps, values, out
+            return result
+        finally:
+            for bloco in blocos:
+                bloco.close()
+                bloco.unlink()
     
-    def process_batch(self, points: Iterable[DataPoint]) -> List[float]:
-        """Processa lote de dados em paralelo"""
+    def process_batch(self, points: Iterable[DataPoint],
+                      backend: str = "thread") -> List[float]:
+        """Processa lote de dados em paralelo
+
+        backend="thread": ThreadPoolExecutor, uma tarefa por ponto (limitado pelo GIL)
+        backend="process": processos + memória compartilhada, um intervalo por worker
+        """
+        if backend == "process":
+            if not isinstance(points, DataPointBatch):
+                points = DataPointBatch.from_points(list(points))
+            return self._process_shared(points).tolist()
+        if backend != "thread":
+            raise ValueError(f"backend desconhecido: {backend!r}")
+        if isinstance(points, DataPointBatch):
+            return self.optimized_analysis(points).tolist()
         with ThreadPoolExecutor(max_workers=self.max_workers) as executor:
             results = list(executor.map(self._process_single, points))
         return results
     
     def optimized_analysis(self, points: List[DataPoint]) -> np.ndarray:
         """Versão otimizada com numpy para grandes datasets"""
+        if isinstance(points, DataPointBatch):
+            # Colunas já contíguas: sem objetos por ponto e sem re-empilhar
+            return points.values.mean(axis=1) * np.log(points.timestamps)
         timestamps = np.array([p.timestamp for p in points])
         values = np.vstack([p.values for p in points])
         return np.mean(values, axis=1) * np.log(timestamps)
 
+
+# Benchmark: lista de dataclasses vs batch colunar
+import time
+
+
+def benchmark_data_processor(n: int = 1_000_000, n_values: int = 8):
+    rng = np.random.default_rng(0)
+    timestamps = rng.uniform(1.0, 1e6, n)
+    values = rng.random((n, n_values))
+
+    points = [DataPoint(t, v.tolist()) for t, v in zip(timestamps, values)]
+    batch = DataPointBatch(n_values)
+    for start in range(0, n, 100_000):  # chega em blocos, como num stream
+        batch.append_chunk(timestamps[start:start + 100_000],
+                           values[start:start + 100_000])
+
+    processor = DataProcessor()
+    start = time.perf_counter()
+    lista = processor.optimized_analysis(points)
+    t_lista = time.perf_counter() - start
+
+    start = time.perf_counter()
+    colunar = processor.optimized_analysis(batch)
+    t_colunar = time.perf_counter() - start
+
+    assert np.allclose(lista, colunar)
+    print(f"lista de DataPoint: {t_lista:.3f}s")
+    print(f"DataPointBatch:     {t_colunar:.3f}s ({t_lista / t_colunar:.0f}x)")
+
+
+if __name__ == "__main__":
+    benchmark_data_processor()
+
 # Exercício Prático
 # Parte 1 (Python Idiomático):
 # Refatore este código para ser mais pythonico:
@@ -147,11 +672,101 @@ class User:
 # Parte 2 (Otimizado):
 import numpy as np
 
-
-def calculate_distances(points):
-    pts = np.array(points)
-    diff = pts[:, np.newaxis, :] - pts[np.newaxis, :, :]
-    distances = np.sqrt((diff**2).sum(axis=-1))
-    return distances[np.triu_indices_from(distances, k=1)].tolist()
-
-
+# A versão "vetorizada ingênua" cria um tensor N×N×2 (30k pontos ≈ 14 GB).
+# BlockedDistances processa a matriz em blocos (tiles) que cabem num
+# orçamento de memória, como o tiling de um GEMM em C++.
+
+
+class BlockedDistances:
+    def __init__(self, points, memoria_bytes: int = 64 * 2**20):
+        self.pts = np.ascontiguousarray(points, dtype=np.float64)
+        if self.pts.ndim != 2:
+            raise ValueError("points deve ter formato (n, dim)")
+        self.n = len(self.pts)
+        # ~3 matrizes temporárias float64 de bloco×bloco vivas ao mesmo tempo
+        self.bloco = max(1, int((memoria_bytes / (3 * 8)) ** 0.5))
+
+    def _tile(self, i0, i1, j0, j1) -> np.ndarray:
+        """Distâncias entre pts[i0:i1] e pts[j0:j1] (sem tensor N×N×dim)"""
+        a, b = self.pts[i0:i1], self.pts[j0:j1]
+        acc = np.zeros((i1 - i0, j1 - j0))
+        for k in range(self.pts.shape[1]):
+            diff = np.subtract.outer(a[:, k], b[:, k])
+            diff *= diff
+            acc += diff
+        return np.sqrt(acc, out=acc)
+
+    def blocks(self):
+        """Gera (i0, j0, tile) cobrindo o triângulo superior, bloco a bloco"""
+        for i0 in range(0, self.n, self.bloco):
+            i1 = min(i0 + self.bloco, self.n)
+            for j0 in range(i0, self.n, self.bloco):
+                yield i0, j0, self._tile(i0, i1, j0, min(j0 + self.bloco, self.n))
+
+    def condensed(self, out=None, path=None) -> np.ndarray:
+        """Vetor condensado (ordem de triu_indices k=1) em `out` ou num memmap em `path`"""
+        total = self.n * (self.n - 1) // 2
+        if out is None:
+            out = (np.memmap(path, dtype=np.float64, mode="w+", shape=(total,))
+                   if path is not None else np.empty(total))
+        elif out.shape != (total,):
+            raise ValueError(f"out deve ter formato ({total},)")
+        for i0, j0, tile in self.blocks():
+            for r in range(tile.shape[0]):
+                i = i0 + r
+                inicio = max(j0, i + 1)  # só j > i
+                if inicio >= j0 + tile.shape[1]:
+                    continue
+                pos = self.n * i - i * (i + 1) // 2 + (inicio - i - 1)
+                segmento = tile[r, inicio - j0:]
+                out[pos:pos + len(segmento)] = segmento
+        return out
+
+    def knn(self, k: int):
+        """k vizinhos mais próximos de cada ponto: (indices, distancias), cada um (n, k)"""
+        if not 0 < k < self.n:
+            raise ValueError("k deve estar em [1, n)")
+        indices = np.empty((self.n, k), dtype=np.intp)
+        distancias = np.empty((self.n, k))
+        for i0 in range(0, self.n, self.bloco):
+            i1 = min(i0 + self.bloco, self.n)
+            linhas = np.arange(i0, i1)
+            best_d = np.full((i1 - i0, k), np.inf)
+            best_i = np.zeros((i1 - i0, k), dtype=np.intp)
+            for j0 in range(0, self.n, self.bloco):
+                j1 = min(j0 + self.bloco, self.n)
+                tile = self._tile(i0, i1, j0, j1)
+                proprio = (linhas >= j0) & (linhas < j1)
+                tile[proprio.nonzero()[0], linhas[proprio] - j0] = np.inf  # exclui i == j
+                cand_d = np.concatenate([best_d, tile], axis=1)
+                cand_i = np.concatenate(
+                    [best_i, np.broadcast_to(np.arange(j0, j1), tile.shape)], axis=1)
+                sel = np.argpartition(cand_d, k - 1, axis=1)[:, :k]
+                best_d = np.take_along_axis(cand_d, sel, axis=1)
+                best_i = np.take_along_axis(cand_i, sel, axis=1)
+            ordem = np.argsort(best_d, axis=1)
+            distancias[i0:i1] = np.take_along_axis(best_d, ordem, axis=1)
+            indices[i0:i1] = np.take_along_axis(best_i, ordem, axis=1)
+        return indices, distancias
+
+    def radius(self, r: float):
+        """Gera (i, j, dist) com i < j e dist <= r, um lote de arrays por bloco"""
+        for i0, j0, tile in self.blocks():
+            ri, rj = np.nonzero(tile <= r)
+            i, j = ri + i0, rj + j0
+            mask = i < j
+            if mask.any():
+                yield i[mask], j[mask], tile[ri[mask], rj[mask]]
+
+
+def calculate_distances(points, memoria_bytes: int = 64 * 2**20):
+    if len(points) < 2:
+        return []
+    return BlockedDistances(points, memoria_bytes).condensed().tolist()
+
+
+# Uso em grande escala:
+# engine = BlockedDistances(pts, memoria_bytes=256 * 2**20)
+# engine.condensed(path="distancias.f64")  # disco via memmap, não RAM
+# idx, dist = engine.knn(5)                 # nunca materializa o vetor condensado
+# for i, j, d in engine.radius(0.01): ...